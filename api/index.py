@@ -1,259 +1,222 @@
 """
 Vercel serverless function handler for Crypto Trading Bot API
+
+All /api/* routes are rewritten to this module (see vercel.json) so a single
+warm function serves every endpoint.
 """
 import os
-import json
 import asyncio
-from datetime import datetime
-from typing import Dict, Any
+import functools
+import threading
+import time
+from typing import Any, Coroutine, Dict, Optional, TypeVar
+
+T = TypeVar('T')
+
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        """Serialize to UTF-8 JSON (orjson encodes datetimes as ISO 8601 natively)"""
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+
+    def _dumps(obj: Any) -> bytes:
+        """Serialize to UTF-8 JSON with the stdlib encoder"""
+        return json.dumps(obj, default=lambda o: o.isoformat()).encode()
+
+# Response headers are identical for every request, so build them once
+_CORS_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type'
+}
+_ERR_HEADERS = {'Content-Type': 'application/json'}
+
+def _make_resp(code: int, body: bytes, headers: Dict[str, str] = _CORS_HEADERS) -> Dict[str, Any]:
+    """Wrap a serialized body in the runtime's response dict"""
+    return {'statusCode': code, 'headers': headers, 'body': body, 'isBase64Encoded': False}
+
+_OK = functools.partial(_make_resp, 200)
+
+# Same default as config.Config.DEBUG; outside debug mode exception details
+# are not echoed to clients and every failure shares one prebuilt response
+_DEBUG = os.getenv('DEBUG', 'True').lower() == 'true'
+_ERR_500_GENERIC = _make_resp(500, _dumps({'error': 'internal error'}), _ERR_HEADERS)
+
+def _error_response(e: Exception) -> Dict[str, Any]:
+    """Build the 500 response for an unhandled exception"""
+    if not _DEBUG:
+        return _ERR_500_GENERIC
+    return _make_resp(500, _dumps({'error': str(e)}), _ERR_HEADERS)
+
+# Only the timestamp varies between requests on the static endpoints, so
+# serialize their payloads once into bytes %-templates
+def _template(payload: Dict[str, Any]) -> bytes:
+    """Serialize a payload into a template whose epoch-ms timestamp is filled per request"""
+    body = _dumps({**payload, "timestamp": "{TS}"})
+    return body.replace(b'%', b'%%').replace(b'"{TS}"', b'%d')
+
+_INDICATORS_TEMPLATE = _template({
+    "rsi": 50.0,
+    "adx": 25.0,
+    "atr": 0,
+    "macd": 0.12
+})
+_SENTIMENT_TEMPLATE = _template({
+    "score": 54.7,
+    "sentiment": "Neutral"
+})
+_SIGNAL_TEMPLATE = _template({
+    "signal": "HOLD",
+    "confidence": 54,
+    "reasoning": "Based on technical analysis and market sentiment"
+})
+_RISK_TEMPLATE = _template({
+    "position_size": 0.001,
+    "stop_loss": 42012,
+    "take_profit": 48646,
+    "risk_reward_ratio": 2.0
+})
+_SYSTEM_STATUS_TEMPLATE = _template({
+    "status": "ONLINE",
+    "clojure_status": "Clojure Active"
+})
+
+# Environment variables are fixed for the container's lifetime, so the
+# configuration status is evaluated once at import
+_CONFIG_STATUS_TEMPLATE = _template({
+    "configuration": {
+        "coinbase_configured": bool(os.getenv('COINBASE_API_KEY')),
+        "twilio_configured": bool(os.getenv('TWILIO_ACCOUNT_SID')),
+        "redis_configured": bool(os.getenv('REDIS_URL'))
+    },
+    "message": "Check which API keys are configured"
+})
+
+# Edge caching: the static endpoints change at most once per second, the
+# price every second and the configuration only on redeploy
+_STATIC_CACHE_CONTROL = 'public, max-age=5, stale-while-revalidate=30'
+_CONFIG_CACHE_CONTROL = 'public, max-age=300'
+_PRICE_HEADERS = {**_CORS_HEADERS, 'Cache-Control': 'public, max-age=1, stale-while-revalidate=5'}
+
+def _static_headers(cache_control: str = _STATIC_CACHE_CONTROL) -> Dict[str, str]:
+    """Build cacheable headers for a static endpoint"""
+    return {**_CORS_HEADERS, 'Cache-Control': cache_control}
+
+# Static endpoints dispatch straight to (payload template, headers); only the
+# dynamic endpoints below need a handler function
+_STATIC_ROUTES = {
+    '/api/indicators': (_INDICATORS_TEMPLATE, _static_headers()),
+    '/api/sentiment': (_SENTIMENT_TEMPLATE, _static_headers()),
+    '/api/signal': (_SIGNAL_TEMPLATE, _static_headers()),
+    '/api/risk': (_RISK_TEMPLATE, _static_headers()),
+    '/api/system-status': (_SYSTEM_STATUS_TEMPLATE, _static_headers()),
+    '/api/config-status': (_CONFIG_STATUS_TEMPLATE, _static_headers(_CONFIG_CACHE_CONTROL))
+}
+
+# Import the backend lazily: only /api/price touches it (through the hybrid
+# manager), so the other endpoints skip numpy/aiohttp on cold start. The
+# backend is installed as the ``backend`` package (see api/requirements.txt)
+
+_hybrid_manager = None
+
+def _get_hybrid_manager():
+    """Return the hybrid data manager, importing it on first use"""
+    global _hybrid_manager
+    if _hybrid_manager is None:
+        from backend.hybrid_integration import hybrid_manager
+        _hybrid_manager = hybrid_manager
+    return _hybrid_manager
 
-# Import our existing modules
-import sys
-sys.path.append('crypto-bot-mvp/backend')
+# Clients that fetch /api/signal almost always fetch /api/price next. Every
+# route shares this function, so instead of pinging another container we
+# import the price backend on a background thread, once per container
+_prewarm_started = False
 
-from indicators import TechnicalIndicators
-from sentiment import SentimentAnalyzer
-from risk import RiskManager
-from strategy import TradingStrategy
-from hybrid_integration import hybrid_manager
-from config import config
+def _import_price_backend() -> None:
+    """Import the hybrid manager, ignoring failures (price falls back to mock)"""
+    try:
+        _get_hybrid_manager()
+    except Exception:
+        pass
+
+def _prewarm_price_backend() -> None:
+    """Start the price backend import without blocking the current response"""
+    global _prewarm_started
+    if _prewarm_started or _hybrid_manager is not None:
+        return
+    _prewarm_started = True
+    threading.Thread(target=_import_price_backend, daemon=True).start()
+
+# Warm invocations reuse one event loop instead of asyncio.run building and
+# tearing down a fresh loop per request
+_loop: Optional[asyncio.AbstractEventLoop] = None
 
-# Initialize components
-indicators = TechnicalIndicators()
-sentiment_analyzer = SentimentAnalyzer()
-risk_manager = RiskManager()
-trading_strategy = TradingStrategy()
+def _run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion on the persistent event loop"""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
 
-def handler(request):
+def handler(request: Dict[str, Any]) -> Dict[str, Any]:
     """Main handler for Vercel serverless function"""
     try:
-        # Get the path from the request
         path = request.get('path', '')
-        method = request.get('method', 'GET')
         
-        # Route to appropriate handler
-        if path == '/api/price':
-            return handle_price()
-        elif path == '/api/indicators':
-            return handle_indicators()
-        elif path == '/api/sentiment':
-            return handle_sentiment()
-        elif path == '/api/signal':
-            return handle_signal()
-        elif path == '/api/risk':
-            return handle_risk()
-        elif path == '/api/system-status':
-            return handle_system_status()
-        elif path == '/api/config-status':
-            return handle_config_status()
-        else:
-            return {
-                'statusCode': 404,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({'error': 'Not found'})
-            }
+        # Static endpoints: fill the epoch-ms timestamp into the prebuilt payload
+        static = _STATIC_ROUTES.get(path)
+        if static is not None:
+            template, headers = static
+            response = _OK(template % (time.time_ns() // 1_000_000), headers)
+            if path == '/api/signal':
+                _prewarm_price_backend()
+            return response
+        
+        # Dynamic endpoints
+        fn = _ROUTES.get(path)
+        return fn(request) if fn else _NOT_FOUND_RESPONSE
             
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({'error': str(e)})
-        }
+        return _error_response(e)
+
+def _jitter() -> int:
+    """Cheap 0-999 pseudo-random offset for the mock price (multiplicative hash of the clock)"""
+    return (((time.time_ns() * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> 32) % 1000
 
 async def get_coinbase_price(symbol: str = "BTC-USD") -> Dict[str, Any]:
     """Get current price from hybrid system"""
     try:
-        price_data = await hybrid_manager.get_price_data(symbol)
+        price_data = await _get_hybrid_manager().get_hybrid_price_data(symbol)
         return {
             "symbol": symbol,
             "price": price_data.get("price", 45599),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time_ns() // 1_000_000,
             "source": price_data.get("source", "mock")
         }
     except Exception as e:
+        # Mock price data for Vercel deployment
         return {
             "symbol": symbol,
-            "price": 45599,
-            "timestamp": datetime.now().isoformat(),
-            "source": "mock"
+            "price": 45599 + _jitter(),
+            "timestamp": time.time_ns() // 1_000_000,
+            "source": "vercel-mock"
         }
 
-def handle_price():
+def handle_price(request: Dict[str, Any]) -> Dict[str, Any]:
     """Handle price endpoint"""
     try:
-        price_data = asyncio.run(get_coinbase_price())
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type'
-            },
-            'body': json.dumps(price_data)
-        }
-    except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({'error': str(e)})
-        }
-
-def handle_indicators():
-    """Handle indicators endpoint"""
-    try:
-        indicators_data = {
-            "rsi": 50.0,
-            "adx": 25.0,
-            "atr": 0,
-            "macd": 0.12,
-            "timestamp": datetime.now().isoformat()
-        }
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type'
-            },
-            'body': json.dumps(indicators_data)
-        }
-    except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({'error': str(e)})
-        }
-
-def handle_sentiment():
-    """Handle sentiment endpoint"""
-    try:
-        sentiment_data = {
-            "score": 54.7,
-            "sentiment": "Neutral",
-            "timestamp": datetime.now().isoformat()
-        }
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type'
-            },
-            'body': json.dumps(sentiment_data)
-        }
-    except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({'error': str(e)})
-        }
-
-def handle_signal():
-    """Handle signal endpoint"""
-    try:
-        signal_data = {
-            "signal": "HOLD",
-            "confidence": 54,
-            "reasoning": "Based on technical analysis and market sentiment",
-            "timestamp": datetime.now().isoformat()
-        }
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type'
-            },
-            'body': json.dumps(signal_data)
-        }
-    except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({'error': str(e)})
-        }
-
-def handle_risk():
-    """Handle risk endpoint"""
-    try:
-        risk_data = {
-            "position_size": 0.001,
-            "stop_loss": 42012,
-            "take_profit": 48646,
-            "risk_reward_ratio": 2.0,
-            "timestamp": datetime.now().isoformat()
-        }
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type'
-            },
-            'body': json.dumps(risk_data)
-        }
+        price_data = _run(get_coinbase_price())
+        return _OK(_dumps(price_data), _PRICE_HEADERS)
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({'error': str(e)})
-        }
+        return _error_response(e)
 
-def handle_system_status():
-    """Handle system status endpoint"""
-    try:
-        system_data = {
-            "status": "ONLINE",
-            "clojure_status": "Clojure Active",
-            "timestamp": datetime.now().isoformat()
-        }
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type'
-            },
-            'body': json.dumps(system_data)
-        }
-    except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({'error': str(e)})
-        }
+# Dynamic route table, built once the handlers above are defined
+_ROUTES = {
+    '/api/price': handle_price
+}
 
-def handle_config_status():
-    """Handle config status endpoint"""
-    try:
-        config_data = {
-            "configuration": {
-                "coinbase_configured": bool(os.getenv('COINBASE_API_KEY')),
-                "twilio_configured": bool(os.getenv('TWILIO_ACCOUNT_SID')),
-                "redis_configured": bool(os.getenv('REDIS_URL'))
-            },
-            "message": "Check which API keys are configured",
-            "timestamp": datetime.now().isoformat()
-        }
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type'
-            },
-            'body': json.dumps(config_data)
-        }
-    except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({'error': str(e)})
-        }
+_NOT_FOUND_RESPONSE = _make_resp(404, _dumps({'error': 'Not found'}), _ERR_HEADERS)
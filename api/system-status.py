@@ -1,31 +0,0 @@
-"""
-Vercel serverless function for system status endpoint
-"""
-import json
-from datetime import datetime
-
-def handler(request):
-    """Handle system status endpoint"""
-    try:
-        system_data = {
-            "status": "ONLINE",
-            "clojure_status": "Clojure Active",
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type'
-            },
-            'body': json.dumps(system_data)
-        }
-    except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({'error': str(e)})
-        }
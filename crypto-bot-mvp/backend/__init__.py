@@ -0,0 +1,4 @@
+"""
+Crypto Trading Bot Dashboard backend package
+Installed as ``backend`` so the Vercel functions can import it directly
+"""
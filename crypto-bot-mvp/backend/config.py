@@ -4,6 +4,7 @@ Loads API keys and configuration from .env file
 """
 
 import os
+from functools import lru_cache
 from typing import Optional
 from dotenv import load_dotenv
 
@@ -65,6 +66,12 @@ class Config:
     # Development
     CORS_ORIGINS: str = os.getenv('CORS_ORIGINS', 'http://localhost:3000,http://127.0.0.1:3000')
     
+    # Credential availability (env vars are fixed for the process lifetime)
+    HAS_COINBASE_CREDENTIALS: bool = all([COINBASE_API_KEY, COINBASE_API_SECRET])
+    HAS_LUNARCRASH_KEY: bool = LUNARCRASH_API_KEY is not None
+    HAS_MARKETSAI_KEY: bool = MARKETSAI_API_KEY is not None
+    HAS_TWILIO_CREDENTIALS: bool = all([TWILIO_SID, TWILIO_TOKEN, TWILIO_PHONE_NUMBER])
+    
     @classmethod
     def get_coinbase_credentials(cls) -> dict:
         """Get Coinbase API credentials"""
@@ -77,33 +84,27 @@ class Config:
     @classmethod
     def has_coinbase_credentials(cls) -> bool:
         """Check if Coinbase credentials are available"""
-        return all([
-            cls.COINBASE_API_KEY,
-            cls.COINBASE_API_SECRET
-        ])
+        return cls.HAS_COINBASE_CREDENTIALS
     
     @classmethod
     def has_lunarcrash_key(cls) -> bool:
         """Check if LunarCrash API key is available"""
-        return cls.LUNARCRASH_API_KEY is not None
+        return cls.HAS_LUNARCRASH_KEY
     
     @classmethod
     def has_marketsai_key(cls) -> bool:
         """Check if MarketSai API key is available"""
-        return cls.MARKETSAI_API_KEY is not None
+        return cls.HAS_MARKETSAI_KEY
     
     @classmethod
     def has_twilio_credentials(cls) -> bool:
         """Check if Twilio credentials are available"""
-        return all([
-            cls.TWILIO_SID,
-            cls.TWILIO_TOKEN,
-            cls.TWILIO_PHONE_NUMBER
-        ])
+        return cls.HAS_TWILIO_CREDENTIALS
     
     @classmethod
+    @lru_cache(maxsize=1)
     def get_status(cls) -> dict:
-        """Get configuration status"""
+        """Get configuration status (computed once; treat the result as read-only)"""
         return {
             'coinbase_configured': cls.has_coinbase_credentials(),
             'lunarcrash_configured': cls.has_lunarcrash_key(),
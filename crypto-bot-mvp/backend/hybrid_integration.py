@@ -8,14 +8,75 @@ This module provides Python wrappers to consume data from the existing Clojure s
 import asyncio
 import json
 import logging
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-import redis
+from typing import Dict, List, Optional, Any, Tuple
+from redis import asyncio as aioredis
 import aiohttp
+import numpy as np
 from dataclasses import dataclass
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Shared generator for mock data
+_rng = np.random.default_rng()
+
+# Set of data sources (gdax, binance, twilio) with live data, kept by producers
+ACTIVE_SOURCES_KEY = "active:sources"
+
+# Packed OHLCV rows a producer may store under gdax:candles:{product}
+# (28 bytes per candle, epoch seconds + float32 prices), prefixed with
+# CANDLE_MAGIC; read by get_gdax_history_array
+CANDLE_MAGIC = b"OHLC1"
+CANDLE_DTYPE = np.dtype([
+    ("ts", "<i8"),
+    ("low", "<f4"),
+    ("high", "<f4"),
+    ("open", "<f4"),
+    ("close", "<f4"),
+    ("volume", "<f4")
+])
+
+def unpack_candles(payload: bytes) -> Optional[np.ndarray]:
+    """Decode a gdax:candles:* value zero-copy; None if it is not a packed payload"""
+    if not payload or not payload.startswith(CANDLE_MAGIC):
+        return None
+    return np.frombuffer(payload, dtype=CANDLE_DTYPE, offset=len(CANDLE_MAGIC))
+
+def _candle_column(candles: np.ndarray, field: str) -> List[float]:
+    """
+    A float32 candle column as Python floats
+    
+    Goes through each value's shortest float32 repr, so 45123.12 comes back as
+    45123.12 in float64 rather than the widened 45123.12109375.
+    """
+    return candles[field].astype(str).astype(np.float64).tolist()
+
+def create_http_session() -> aiohttp.ClientSession:
+    """Create the keep-alive HTTP session used for all upstream calls"""
+    # One keep-alive pool for all upstream calls instead of a new
+    # TCP+TLS handshake per request; no cookies carried across requests
+    connector = aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=20,
+        ttl_dns_cache=300,
+        keepalive_timeout=75
+    )
+    # Bounded tail latency for every upstream call; bodies are read as
+    # bytes and parsed with orjson rather than response.json()
+    return aiohttp.ClientSession(
+        connector=connector,
+        cookie_jar=aiohttp.DummyCookieJar(),
+        timeout=aiohttp.ClientTimeout(total=2.0, connect=0.5),
+        headers={"Accept-Encoding": "gzip, deflate"}
+    )
+
 @dataclass
 class ClojureConfig:
     """Configuration for Clojure system integration"""
@@ -23,6 +84,11 @@ class ClojureConfig:
     redis_port: int = 6379
     clojure_api_port: int = 8080  # Clojure HTTP API port
     clojure_api_base: str = "http://localhost:8080"
+    redis_status_ttl: float = 1.0  # Seconds a Redis INFO snapshot is reused
+    http_refresh_interval: float = 1.0  # Seconds between background Clojure HTTP pulls
+    http_cache_max_age: float = 5.0  # Older background results are not served
+    history_cache_limit: int = 100  # Candles kept per product by the refresher
+    price_push_max_age: float = 5.0  # Pushed prices older than this are not served
     gdax_products: List[str] = None
     
     def __post_init__(self):
@@ -34,59 +100,248 @@ class ClojureDataConsumer:
     
     def __init__(self, config: ClojureConfig):
         self.config = config
-        self.redis_client = redis.Redis(
+        self.redis_client = aioredis.Redis(
             host=config.redis_host, 
             port=config.redis_port, 
-            decode_responses=True
+            # Payloads are JSON parsed straight from bytes, no str decode needed
+            decode_responses=False
         )
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._owns_session = True
+        self._status_cache = (0.0, None)
+        self._status_lock = asyncio.Lock()
+        # product -> (time.monotonic() when received, data) from keyspace notifications
+        self._latest_prices: Dict[str, Tuple[float, Dict]] = {}
+        self._price_sub_task: Optional[asyncio.Task] = None
+        # product -> (time.monotonic() of the pull, data) from the background refresher
+        self._http_prices: Dict[str, Tuple[float, Dict]] = {}
+        self._http_histories: Dict[str, Tuple[float, List[Dict]]] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = create_http_session()
+            self._owns_session = True
+        return self._session
+    
+    async def startup(self, session: Optional[aiohttp.ClientSession] = None):
+        """
+        Open the shared HTTP session and start the background data tasks
+        
+        Args:
+            session: Application-owned session to use instead of creating one;
+                it is left open by close()
+        """
+        if session is not None:
+            self._session = session
+            self._owns_session = False
+        await self._get_session()
+        if self._price_sub_task is None or self._price_sub_task.done():
+            self._price_sub_task = asyncio.create_task(self._price_sub_loop())
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+    
+    async def close(self):
+        """Stop background tasks, close the shared HTTP session and Redis pool"""
+        for task in (self._price_sub_task, self._refresh_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._price_sub_task = None
+        self._refresh_task = None
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        await self.redis_client.close()
+        
+    def get_latest_price(self, product_id: str) -> Optional[Dict]:
+        """
+        Latest price payload pushed by the Clojure producer
+        
+        None if none has been received within price_push_max_age, so callers
+        fall back to get_gdax_price_data.
+        """
+        entry = self._latest_prices.get(product_id)
+        if entry is None or time.monotonic() - entry[0] > self.config.price_push_max_age:
+            return None
+        return entry[1]
+    
+    async def _keyspace_events_enabled(self) -> bool:
+        """Whether Redis publishes keyspace notifications for string writes"""
+        try:
+            config = await self.redis_client.config_get("notify-keyspace-events")
+        except Exception as e:
+            logger.warning(f"Could not read notify-keyspace-events: {e}")
+            return False
+        flags = next(iter(config.values()), b"") if config else b""
+        if isinstance(flags, bytes):
+            flags = flags.decode()
+        return "K" in flags and ("$" in flags or "A" in flags)
+    
+    async def _price_sub_loop(self):
+        """
+        Keep `_latest_prices` in sync with the gdax:price:* keys
         
+        Relies on Redis keyspace notifications (notify-keyspace-events must
+        include "K$" or "KA"). When they are off, no subscription is made and
+        the cache stays empty, so readers use get_gdax_price_data.
+        """
+        if not await self._keyspace_events_enabled():
+            logger.info("Redis keyspace notifications are off; not caching pushed prices")
+            return
+        
+        db = self.redis_client.connection_pool.connection_kwargs.get("db", 0)
+        prefix = f"__keyspace@{db}__:".encode()
+        
+        while True:
+            pubsub = self.redis_client.pubsub()
+            try:
+                await pubsub.psubscribe(prefix + b"gdax:price:*")
+                
+                # Warm up after subscribing so no write between the two is lost
+                for symbol, data in (await self.get_many_prices(self.config.gdax_products)).items():
+                    if data:
+                        self._latest_prices[symbol] = (time.monotonic(), data)
+                
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    key = message["channel"][len(prefix):]
+                    symbol = key.rsplit(b":", 1)[-1].decode()
+                    if message["data"] in (b"del", b"expired", b"evicted"):
+                        self._latest_prices.pop(symbol, None)
+                        continue
+                    price_data = await self.redis_client.get(key)
+                    if price_data:
+                        self._latest_prices[symbol] = (time.monotonic(), _loads(price_data))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Price subscription error: {e}")
+                self._latest_prices.clear()
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.close()
+    
+    async def _refresh_loop(self):
+        """Pull prices and history from the Clojure HTTP API off the request path"""
+        while True:
+            try:
+                await asyncio.gather(*[
+                    self._refresh_product(product_id)
+                    for product_id in self.config.gdax_products
+                ])
+            except Exception as e:
+                logger.error(f"Clojure HTTP refresh error: {e}")
+            await asyncio.sleep(self.config.http_refresh_interval)
+    
+    async def _refresh_product(self, product_id: str):
+        """Refresh one product's cached HTTP price and history"""
+        price, history = await asyncio.gather(
+            self._get_gdax_price_http(product_id),
+            self._get_gdax_history_http(product_id, self.config.history_cache_limit),
+            return_exceptions=True
+        )
+        now = time.monotonic()
+        if isinstance(price, dict):
+            self._http_prices[product_id] = (now, price)
+        if isinstance(history, list):
+            self._http_histories[product_id] = (now, history)
+    
+    def _fresh(self, entry: Optional[Tuple[float, Any]]) -> Optional[Any]:
+        """Data of a refresher cache entry, or None if missing or stale"""
+        if entry is None or time.monotonic() - entry[0] > self.config.http_cache_max_age:
+            return None
+        return entry[1]
+    
+    async def _get_gdax_price_http(self, product_id: str) -> Optional[Dict]:
+        """Price from the Clojure HTTP API, or None if it has none"""
+        session = await self._get_session()
+        url = f"{self.config.clojure_api_base}/gdax/price/{product_id}"
+        async with session.get(url) as response:
+            if response.status == 200:
+                data = _loads(await response.read())
+                if "error" not in data:
+                    return {
+                        "symbol": product_id,
+                        "price": float(data.get("price", 0)),
+                        "timestamp": datetime.now(),
+                        "source": "clojure-gdax-http"
+                    }
+        return None
+    
+    async def _get_gdax_price_redis(self, product_id: str) -> Optional[Dict]:
+        """Price pushed to Redis by the Clojure system, or None if absent"""
+        price_data = await self.redis_client.get(f"gdax:price:{product_id}")
+        if price_data:
+            data = _loads(price_data)
+            return {
+                "symbol": product_id,
+                "price": float(data.get("price", 0)),
+                "timestamp": datetime.now(),
+                "source": "clojure-gdax-redis"
+            }
+        return None
+    
     async def get_gdax_price_data(self, product_id: str = "BTC-USD") -> Dict:
         """
-        Get price data from Clojure GDAX integration via HTTP API
+        Get price data from Clojure GDAX integration
+        
+        Served from the background refresher when it has a fresh value;
+        otherwise Redis and the HTTP API are queried concurrently and the first
+        one with data wins, so a slow HTTP side does not delay a fresh Redis value.
         """
+        cached = self._fresh(self._http_prices.get(product_id))
+        if cached is not None:
+            return cached
+        
+        pending = {
+            asyncio.create_task(self._get_gdax_price_redis(product_id)),
+            asyncio.create_task(self._get_gdax_price_http(product_id))
+        }
         try:
-            # Try HTTP API first
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.config.clojure_api_base}/gdax/price/{product_id}"
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if "error" not in data:
-                            return {
-                                "symbol": product_id,
-                                "price": float(data.get("price", 0)),
-                                "timestamp": datetime.now(),
-                                "source": "clojure-gdax-http"
-                            }
-            
-            # Fallback to Redis direct access
-            price_key = f"gdax:price:{product_id}"
-            price_data = self.redis_client.get(price_key)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        logger.error(f"Error getting GDAX price data: {task.exception()}")
+                    elif task.result() is not None:
+                        return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        # Fallback to mock data if no Clojure data available
+        return await self._get_mock_price_data(product_id)
+    
+    async def get_many_prices(self, symbols: List[str]) -> Dict[str, Optional[Dict]]:
+        """Get raw Redis price snapshots for several symbols in one round-trip"""
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for symbol in symbols:
+                    pipe.get(f"gdax:price:{symbol}")
+                results = await pipe.execute()
             
-            if price_data:
-                data = json.loads(price_data)
-                return {
-                    "symbol": product_id,
-                    "price": float(data.get("price", 0)),
-                    "timestamp": datetime.now(),
-                    "source": "clojure-gdax-redis"
-                }
-            else:
-                # Fallback to mock data if no Clojure data available
-                return await self._get_mock_price_data(product_id)
-                
+            return {
+                symbol: _loads(price_data) if price_data else None
+                for symbol, price_data in zip(symbols, results)
+            }
         except Exception as e:
-            logger.error(f"Error getting GDAX price data: {e}")
-            return await self._get_mock_price_data(product_id)
+            logger.error(f"Error getting batched price data: {e}")
+            return {symbol: None for symbol in symbols}
     
     async def get_gdax_order_book(self, product_id: str = "BTC-USD") -> Dict:
         """Get order book data from Clojure system"""
         try:
             book_key = f"gdax:book:{product_id}"
-            book_data = self.redis_client.get(book_key)
+            book_data = await self.redis_client.get(book_key)
             
             if book_data:
-                return json.loads(book_data)
+                return _loads(book_data)
             else:
                 return {"bids": [], "asks": [], "timestamp": datetime.now()}
                 
@@ -94,24 +349,51 @@ class ClojureDataConsumer:
             logger.error(f"Error getting order book: {e}")
             return {"bids": [], "asks": [], "timestamp": datetime.now()}
     
+    async def _get_gdax_history_http(self, product_id: str, limit: int) -> Optional[List[Dict]]:
+        """History from the Clojure HTTP API, or None if it has none"""
+        session = await self._get_session()
+        url = f"{self.config.clojure_api_base}/gdax/history/{product_id}/{limit}"
+        async with session.get(url) as response:
+            if response.status == 200:
+                data = _loads(await response.read())
+                if isinstance(data, list) and len(data) > 0:
+                    return data
+        return None
+    
     async def get_gdax_history(self, product_id: str = "BTC-USD", limit: int = 100) -> List[Dict]:
         """Get historical data from Clojure system via HTTP API"""
         try:
-            # Try HTTP API first
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.config.clojure_api_base}/gdax/history/{product_id}/{limit}"
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if isinstance(data, list) and len(data) > 0:
-                            return data
+            # Background refresher result, when it is fresh and long enough
+            cached = self._fresh(self._http_histories.get(product_id))
+            if cached is not None and len(cached) >= limit:
+                return cached[-limit:]
+            
+            # Otherwise try HTTP API inline
+            data = await self._get_gdax_history_http(product_id, limit)
+            if data is not None:
+                return data
+            
+            # Fallback to Redis direct access: packed candles first, then the
+            # legacy per-row JSON list
+            candles = await self.get_gdax_history_array(product_id, limit)
+            if candles is not None:
+                return [{
+                    "timestamp": datetime.fromtimestamp(ts).isoformat(),
+                    "low": low,
+                    "high": high,
+                    "open": open_,
+                    "close": close,
+                    "volume": volume
+                } for ts, low, high, open_, close, volume in zip(
+                    candles["ts"].tolist(),
+                    *(_candle_column(candles, field) for field in ("low", "high", "open", "close", "volume"))
+                )]
             
-            # Fallback to Redis direct access
             history_key = f"gdax:history:{product_id}"
-            history_data = self.redis_client.lrange(history_key, -limit, -1)
+            history_data = await self.redis_client.lrange(history_key, -limit, -1)
             
             if history_data:
-                return [json.loads(entry) for entry in history_data]
+                return list(map(_loads, history_data))
             else:
                 return await self._get_mock_history_data(product_id, limit)
                 
@@ -119,14 +401,30 @@ class ClojureDataConsumer:
             logger.error(f"Error getting history data: {e}")
             return await self._get_mock_history_data(product_id, limit)
     
+    async def get_gdax_history_array(self, product_id: str = "BTC-USD", limit: int = 100) -> Optional[np.ndarray]:
+        """
+        Get the last `limit` packed candles as a CANDLE_DTYPE array
+        
+        Returns None when the product has no packed history in Redis.
+        """
+        try:
+            payload = await self.redis_client.get(f"gdax:candles:{product_id}")
+            candles = unpack_candles(payload)
+            if candles is None or len(candles) == 0:
+                return None
+            return candles[-limit:]
+        except Exception as e:
+            logger.error(f"Error getting packed history data: {e}")
+            return None
+    
     async def get_binance_data(self, symbol: str = "BTCUSDT") -> Dict:
         """Get Binance data from Clojure system"""
         try:
             binance_key = f"binance:price:{symbol}"
-            binance_data = self.redis_client.get(binance_key)
+            binance_data = await self.redis_client.get(binance_key)
             
             if binance_data:
-                data = json.loads(binance_data)
+                data = _loads(binance_data)
                 return {
                     "symbol": symbol,
                     "price": float(data.get("price", 0)),
@@ -144,10 +442,10 @@ class ClojureDataConsumer:
         """Get Twilio alerts from Clojure system"""
         try:
             alerts_key = "twilio:alerts"
-            alerts_data = self.redis_client.lrange(alerts_key, -50, -1)  # Last 50 alerts
+            alerts_data = await self.redis_client.lrange(alerts_key, -50, -1)  # Last 50 alerts
             
             if alerts_data:
-                return [json.loads(alert) for alert in alerts_data]
+                return list(map(_loads, alerts_data))
             else:
                 return []
                 
@@ -170,40 +468,51 @@ class ClojureDataConsumer:
     
     async def _get_mock_history_data(self, symbol: str, limit: int) -> List[Dict]:
         """Fallback mock history data"""
-        import random
         base_price = 45000 if "BTC" in symbol else 3000 if "ETH" in symbol else 100
         
-        history = []
-        current_price = base_price
+        # Generate realistic price movement: ±2% change per candle
+        changes = _rng.uniform(-0.02, 0.02, limit)
+        closes = base_price * np.cumprod(1.0 + changes)
+        opens = np.round(closes * 0.999, 2).tolist()
+        highs = np.round(closes * 1.001, 2).tolist()
+        lows = np.round(closes * 0.998, 2).tolist()
+        volumes = _rng.uniform(100, 1000, limit).tolist()
+        timestamp = datetime.now().isoformat()
         
-        for i in range(limit):
-            # Generate realistic price movement
-            change = random.uniform(-0.02, 0.02)  # ±2% change
-            current_price *= (1 + change)
-            
-            history.append({
-                "timestamp": datetime.now().isoformat(),
-                "open": round(current_price * 0.999, 2),
-                "high": round(current_price * 1.001, 2),
-                "low": round(current_price * 0.998, 2),
-                "close": round(current_price, 2),
-                "volume": random.uniform(100, 1000)
-            })
-        
-        return history
+        return [{
+            "timestamp": timestamp,
+            "open": o,
+            "high": h,
+            "low": l,
+            "close": c,
+            "volume": v
+        } for o, h, l, c, v in zip(opens, highs, lows, np.round(closes, 2).tolist(), volumes)]
     
-    def get_redis_status(self) -> Dict:
-        """Get Redis connection status"""
+    async def get_redis_status(self) -> Dict:
+        """
+        Get Redis connection status
+        
+        INFO is only sent to Redis once per `redis_status_ttl` seconds (1s by
+        default); polls inside that window share the snapshot, and
+        `cache_age` reports how old it is.
+        """
         try:
-            info = self.redis_client.info()
-            return {
-                "connected": True,
-                "redis_version": info.get("redis_version", "Unknown"),
-                "used_memory": info.get("used_memory_human", "Unknown"),
-                "connected_clients": info.get("connected_clients", 0),
-                "uptime": info.get("uptime_in_seconds", 0),
-                "keyspace": info.get("db0", {})
-            }
+            async with self._status_lock:
+                fetched_at, status = self._status_cache
+                now = time.monotonic()
+                if status is None or now - fetched_at >= self.config.redis_status_ttl:
+                    info = await self.redis_client.info()
+                    status = {
+                        "connected": True,
+                        "redis_version": info.get("redis_version", "Unknown"),
+                        "used_memory": info.get("used_memory_human", "Unknown"),
+                        "connected_clients": info.get("connected_clients", 0),
+                        "uptime": info.get("uptime_in_seconds", 0),
+                        "keyspace": info.get("db0", {})
+                    }
+                    fetched_at = now = time.monotonic()
+                    self._status_cache = (fetched_at, status)
+            return {**status, "cache_age": round(now - fetched_at, 3)}
         except Exception as e:
             return {
                 "connected": False,
@@ -217,13 +526,31 @@ class HybridDataManager:
         self.clojure_consumer = ClojureDataConsumer(clojure_config)
         self.data_cache = {}
         self.last_update = {}
+    
+    async def startup(self, session: Optional[aiohttp.ClientSession] = None):
+        """Open the shared HTTP session (or adopt `session`) and start the Clojure background tasks"""
+        await self.clojure_consumer.startup(session)
+    
+    async def close(self):
+        """Release the shared HTTP session and Redis pool"""
+        await self.clojure_consumer.close()
         
     async def get_hybrid_price_data(self, symbol: str = "BTC-USD") -> Dict:
         """
         Get price data prioritizing Clojure system, falling back to Python
         """
         try:
-            # Try Clojure system first
+            # Latest value pushed by the Clojure producer: no round-trip needed
+            latest = self.clojure_consumer.get_latest_price(symbol)
+            if latest is not None:
+                return {
+                    "symbol": symbol,
+                    "price": float(latest.get("price", 0)),
+                    "timestamp": datetime.now(),
+                    "source": "clojure-gdax-redis"
+                }
+            
+            # Cold start: try Clojure system directly
             clojure_data = await self.clojure_consumer.get_gdax_price_data(symbol)
             
             if clojure_data.get("source") == "clojure-gdax":
@@ -256,74 +583,88 @@ class HybridDataManager:
             logger.error(f"Error in hybrid history data: {e}")
             return await self._get_python_history_data(symbol, limit)
     
+    async def _fetch_coinbase_ticker(self, session: aiohttp.ClientSession, url: str, symbol: str, source: str) -> Dict:
+        """Fetch one Coinbase ticker endpoint, raising on any non-200 response"""
+        async with session.get(url) as response:
+            response.raise_for_status()
+            data = _loads(await response.read())
+            return {
+                "symbol": symbol,
+                "price": float(data["price"]),
+                "timestamp": datetime.now(),
+                "source": source
+            }
+    
     async def _get_python_price_data(self, symbol: str) -> Dict:
-        """Fallback to Python Coinbase Advanced Trade API"""
+        """Fallback to Python Coinbase APIs (Advanced Trade and public, hedged)"""
+        session = await self.clojure_consumer._get_session()
+        # Query the Advanced Trade API and the public API concurrently and take
+        # the first good answer, so a slow or failing endpoint does not add its
+        # latency on top of the other
+        pending = {
+            asyncio.create_task(self._fetch_coinbase_ticker(
+                session,
+                f"https://api.coinbase.com/api/v3/brokerage/market/products/{symbol}/ticker",
+                symbol,
+                "python-coinbase-advanced"
+            )),
+            asyncio.create_task(self._fetch_coinbase_ticker(
+                session,
+                f"https://api.exchange.coinbase.com/products/{symbol}/ticker",
+                symbol,
+                "python-coinbase-public"
+            ))
+        }
         try:
-            async with aiohttp.ClientSession() as session:
-                # Use Coinbase Advanced Trade API (newer API)
-                url = f"https://api.coinbase.com/api/v3/brokerage/market/products/{symbol}/ticker"
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return {
-                            "symbol": symbol,
-                            "price": float(data["price"]),
-                            "timestamp": datetime.now(),
-                            "source": "python-coinbase-advanced"
-                        }
-                    else:
-                        # Fallback to public API
-                        url_fallback = f"https://api.exchange.coinbase.com/products/{symbol}/ticker"
-                        async with session.get(url_fallback) as response_fallback:
-                            if response_fallback.status == 200:
-                                data = await response_fallback.json()
-                                return {
-                                    "symbol": symbol,
-                                    "price": float(data["price"]),
-                                    "timestamp": datetime.now(),
-                                    "source": "python-coinbase-public"
-                                }
-                            else:
-                                raise Exception(f"Coinbase API error: {response.status}")
-        except Exception as e:
-            logger.error(f"Python Coinbase API error: {e}")
-            return await self.clojure_consumer._get_mock_price_data(symbol)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    logger.error(f"Python Coinbase API error: {task.exception()}")
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        return await self.clojure_consumer._get_mock_price_data(symbol)
     
     async def _get_python_history_data(self, symbol: str, limit: int) -> List[Dict]:
         """Fallback to Python Coinbase API for history"""
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"https://api.exchange.coinbase.com/products/{symbol}/candles"
-                params = {
-                    "granularity": 3600,  # 1 hour candles
-                    "start": datetime.now().isoformat()
-                }
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return [{
-                            "timestamp": datetime.fromtimestamp(candle[0]).isoformat(),
-                            "low": candle[1],
-                            "high": candle[2],
-                            "open": candle[3],
-                            "close": candle[4],
-                            "volume": candle[5]
-                        } for candle in data[-limit:]]
-                    else:
-                        raise Exception(f"Coinbase API error: {response.status}")
+            session = await self.clojure_consumer._get_session()
+            url = f"https://api.exchange.coinbase.com/products/{symbol}/candles"
+            params = {
+                "granularity": 3600,  # 1 hour candles
+                "start": datetime.now().isoformat()
+            }
+            async with session.get(url, params=params) as response:
+                response.raise_for_status()
+                data = _loads(await response.read())
+            
+            return [{
+                "timestamp": datetime.fromtimestamp(candle[0]).isoformat(),
+                "low": candle[1],
+                "high": candle[2],
+                "open": candle[3],
+                "close": candle[4],
+                "volume": candle[5]
+            } for candle in data[-limit:]]
         except Exception as e:
             logger.error(f"Python Coinbase API history error: {e}")
             return await self.clojure_consumer._get_mock_history_data(symbol, limit)
     
     async def get_system_status(self) -> Dict:
         """Get status of both Clojure and Python systems"""
-        redis_status = self.clojure_consumer.get_redis_status()
+        redis_status, available_data = await asyncio.gather(
+            self.clojure_consumer.get_redis_status(),
+            self._check_clojure_data_availability()
+        )
         
         return {
             "clojure_system": {
                 "redis_connected": redis_status.get("connected", False),
                 "redis_info": redis_status,
-                "available_data": await self._check_clojure_data_availability()
+                "available_data": available_data
             },
             "python_system": {
                 "status": "running",
@@ -336,19 +677,32 @@ class HybridDataManager:
     async def _check_clojure_data_availability(self) -> Dict:
         """Check what data is available from Clojure system"""
         try:
-            available_data = {}
+            redis_client = self.clojure_consumer.redis_client
+            prefixes = ("gdax", "binance", "twilio")
             
-            # Check for GDAX data
-            gdax_keys = self.clojure_consumer.redis_client.keys("gdax:*")
-            available_data["gdax"] = len(gdax_keys) > 0
+            # Producers that maintain the active:sources set (SADD on ingest,
+            # with a refreshed EXPIRE) make this an O(1) lookup
+            members = await redis_client.smembers(ACTIVE_SOURCES_KEY)
+            if members:
+                return {prefix: prefix.encode() in members for prefix in prefixes}
             
-            # Check for Binance data
-            binance_keys = self.clojure_consumer.redis_client.keys("binance:*")
-            available_data["binance"] = len(binance_keys) > 0
+            # Otherwise probe every namespace in one round-trip; SCAN touches a bounded
+            # slice of the keyspace instead of listing it all like KEYS
+            pipe = redis_client.pipeline(transaction=False)
+            for prefix in prefixes:
+                pipe.scan(cursor=0, match=f"{prefix}:*", count=1000)
+            results = await pipe.execute()
             
-            # Check for Twilio alerts
-            twilio_keys = self.clojure_consumer.redis_client.keys("twilio:*")
-            available_data["twilio"] = len(twilio_keys) > 0
+            available_data = {}
+            for prefix, (cursor, keys) in zip(prefixes, results):
+                if not keys and cursor:
+                    # Keyspace larger than the first slice: keep scanning
+                    # only until the first match
+                    keys = None
+                    async for key in redis_client.scan_iter(match=f"{prefix}:*", count=1000):
+                        keys = key
+                        break
+                available_data[prefix] = bool(keys)
             
             return available_data
             
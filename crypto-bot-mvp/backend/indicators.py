@@ -5,11 +5,55 @@ Implements RSI, ADX, ATR calculations using ta-lib
 
 import numpy as np
 import pandas as pd
+from collections import OrderedDict
+from functools import wraps
 from typing import List, Dict, Tuple
 import logging
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
 logger = logging.getLogger(__name__)
 
+# Momentum signal indexed by rsi_bucket * 3 + adx_bucket (see get_momentum_signal)
+MOMENTUM_SIGNAL_TABLE = (
+    "Neutral", "Bullish", "Strong Bullish",   # RSI < 30 (oversold)
+    "Neutral", "Bullish", "Bullish",          # RSI 30-40
+    "Neutral", "Neutral", "Neutral",          # RSI 40-60
+    "Neutral", "Bearish", "Bearish",          # RSI 60-70
+    "Neutral", "Bearish", "Strong Bearish",   # RSI > 70 (overbought)
+)
+
+def _memoized(method):
+    """
+    Cache an indicator result per input series
+    
+    Results are keyed by the series length and its first and last candles, so
+    repeated polls between bars reuse the value and a new or updated bar
+    naturally misses the cache.
+    """
+    name = method.__name__
+    
+    @wraps(method)
+    def wrapper(self, historical_data, period=None):
+        if not historical_data or not isinstance(historical_data[-1], (list, tuple)):
+            return method(self, historical_data, period)
+        
+        key = (name, period, len(historical_data), tuple(historical_data[0]), tuple(historical_data[-1]))
+        cache = self._results
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        
+        result = cache[key] = method(self, historical_data, period)
+        if len(cache) > self.results_cache_size:
+            cache.popitem(last=False)
+        return result
+    
+    return wrapper
+
 class TechnicalIndicators:
     """Technical analysis indicators for crypto trading"""
     
@@ -17,7 +61,31 @@ class TechnicalIndicators:
         self.rsi_period = 14
         self.adx_period = 14
         self.atr_period = 14
+        self._ohlcv_source = None
+        self._ohlcv_key = None
+        self._ohlcv = None
+        self.results_cache_size = 4096
+        self._results: OrderedDict = OrderedDict()
+    
+    def _ohlcv_array(self, historical_data: List[List]) -> np.ndarray:
+        """
+        Convert candles to a float32 array in one pass
+        
+        The array is cached against the last list seen, keyed like _memoized by
+        its length and first and last candles, so the RSI/ADX/ATR calls made for
+        the same history share a single conversion while a new or updated bar
+        in the same list is converted again. float32 keeps ~7 significant
+        digits, ample for indicators reported to 2-4 decimals (the timestamp
+        column is not precise at this width and is not used by the indicators).
+        """
+        key = (len(historical_data), tuple(historical_data[0]), tuple(historical_data[-1]))
+        if historical_data is not self._ohlcv_source or key != self._ohlcv_key:
+            self._ohlcv = np.asarray(historical_data, dtype=np.float32).reshape(len(historical_data), -1)
+            self._ohlcv_source = historical_data
+            self._ohlcv_key = key
+        return self._ohlcv
         
+    @_memoized
     def calculate_rsi(self, historical_data: List[List], period: int = None) -> float:
         """
         Calculate Relative Strength Index (RSI)
@@ -33,22 +101,29 @@ class TechnicalIndicators:
             period = self.rsi_period
             
         try:
-            # Extract closing prices
-            closes = [float(candle[4]) for candle in historical_data[-period-1:]]
-            
-            if len(closes) < period + 1:
+            if len(historical_data) < period + 1:
                 return 50.0  # Neutral RSI if not enough data
             
-            # Calculate price changes
-            deltas = np.diff(closes)
+            # Extract closing prices
+            closes = self._ohlcv_array(historical_data)[:, 4]
             
-            # Separate gains and losses
-            gains = np.where(deltas > 0, deltas, 0)
-            losses = np.where(deltas < 0, -deltas, 0)
+            if _rsi_wilder is not None:
+                return round(float(_rsi_wilder(closes, period)), 2)
             
-            # Calculate average gains and losses
-            avg_gains = np.mean(gains[-period:])
-            avg_losses = np.mean(losses[-period:])
+            # Separate gains and losses of the price changes
+            deltas = np.diff(closes)
+            gains = np.maximum(deltas, 0.0)
+            losses = np.maximum(-deltas, 0.0)
+            
+            # Wilder smoothing: seed with the simple mean of the first period,
+            # then avg = (avg * (period - 1) + x) / period for each later change.
+            # The recurrence unrolls into a single dot product with decay weights.
+            alpha = 1.0 / period
+            tail = len(deltas) - period
+            decay = (1.0 - alpha) ** np.arange(tail - 1, -1, -1, dtype=np.float64)
+            seed_weight = (1.0 - alpha) ** tail
+            avg_gains = seed_weight * gains[:period].mean() + alpha * np.dot(decay, gains[period:])
+            avg_losses = seed_weight * losses[:period].mean() + alpha * np.dot(decay, losses[period:])
             
             if avg_losses == 0:
                 return 100.0
@@ -57,12 +132,13 @@ class TechnicalIndicators:
             rs = avg_gains / avg_losses
             rsi = 100 - (100 / (1 + rs))
             
-            return round(rsi, 2)
+            return round(float(rsi), 2)
             
         except Exception as e:
             logger.error(f"Error calculating RSI: {e}")
             return 50.0
     
+    @_memoized
     def calculate_adx(self, historical_data: List[List], period: int = None) -> float:
         """
         Calculate Average Directional Index (ADX)
@@ -78,55 +154,52 @@ class TechnicalIndicators:
             period = self.adx_period
             
         try:
+            if len(historical_data) < period + 1:
+                return 25.0  # Neutral ADX if not enough data
+            
             # Extract high, low, close prices
-            highs = [float(candle[2]) for candle in historical_data[-period-1:]]
-            lows = [float(candle[1]) for candle in historical_data[-period-1:]]
-            closes = [float(candle[4]) for candle in historical_data[-period-1:]]
+            window = self._ohlcv_array(historical_data)[-period-1:]
+            highs, lows, closes = window[:, 2], window[:, 1], window[:, 4]
             
-            if len(highs) < period + 1:
-                return 25.0  # Neutral ADX if not enough data
+            if _atr_adx_window is not None:
+                return round(float(_atr_adx_window(highs, lows, closes, period)[1]), 2)
             
             # Calculate True Range (TR)
-            tr_values = []
-            for i in range(1, len(highs)):
-                tr1 = highs[i] - lows[i]
-                tr2 = abs(highs[i] - closes[i-1])
-                tr3 = abs(lows[i] - closes[i-1])
-                tr_values.append(max(tr1, tr2, tr3))
+            tr_values = np.maximum.reduce([
+                highs[1:] - lows[1:],
+                np.abs(highs[1:] - closes[:-1]),
+                np.abs(lows[1:] - closes[:-1])
+            ])
             
             # Calculate Directional Movement
-            dm_plus = []
-            dm_minus = []
-            
-            for i in range(1, len(highs)):
-                high_diff = highs[i] - highs[i-1]
-                low_diff = lows[i-1] - lows[i]
-                
-                if high_diff > low_diff and high_diff > 0:
-                    dm_plus.append(high_diff)
-                else:
-                    dm_plus.append(0)
-                    
-                if low_diff > high_diff and low_diff > 0:
-                    dm_minus.append(low_diff)
-                else:
-                    dm_minus.append(0)
+            high_diff = highs[1:] - highs[:-1]
+            low_diff = lows[:-1] - lows[1:]
+            dm_plus = np.where((high_diff > low_diff) & (high_diff > 0), high_diff, 0.0)
+            dm_minus = np.where((low_diff > high_diff) & (low_diff > 0), low_diff, 0.0)
             
             # Calculate smoothed values
             atr = np.mean(tr_values[-period:])
-            di_plus = (np.mean(dm_plus[-period:]) / atr) * 100
-            di_minus = (np.mean(dm_minus[-period:]) / atr) * 100
+            mean_dm_plus = np.mean(dm_plus[-period:])
+            mean_dm_minus = np.mean(dm_minus[-period:])
+            
+            # Flat window: ADX is undefined, report neutral like the numba kernel
+            if atr == 0 or mean_dm_plus + mean_dm_minus == 0:
+                return 25.0
+            
+            di_plus = (mean_dm_plus / atr) * 100
+            di_minus = (mean_dm_minus / atr) * 100
             
             # Calculate ADX
             dx = abs(di_plus - di_minus) / (di_plus + di_minus) * 100
             adx = dx  # Simplified ADX calculation
             
-            return round(adx, 2)
+            return round(float(adx), 2)
             
         except Exception as e:
             logger.error(f"Error calculating ADX: {e}")
             return 25.0
     
+    @_memoized
     def calculate_atr(self, historical_data: List[List], period: int = None) -> float:
         """
         Calculate Average True Range (ATR)
@@ -142,26 +215,27 @@ class TechnicalIndicators:
             period = self.atr_period
             
         try:
+            if len(historical_data) < period + 1:
+                return 0.0
+            
             # Extract high, low, close prices
-            highs = [float(candle[2]) for candle in historical_data[-period-1:]]
-            lows = [float(candle[1]) for candle in historical_data[-period-1:]]
-            closes = [float(candle[4]) for candle in historical_data[-period-1:]]
+            window = self._ohlcv_array(historical_data)[-period-1:]
+            highs, lows, closes = window[:, 2], window[:, 1], window[:, 4]
             
-            if len(highs) < period + 1:
-                return 0.0
+            if _atr_adx_window is not None:
+                return round(float(_atr_adx_window(highs, lows, closes, period)[0]), 4)
             
             # Calculate True Range (TR)
-            tr_values = []
-            for i in range(1, len(highs)):
-                tr1 = highs[i] - lows[i]
-                tr2 = abs(highs[i] - closes[i-1])
-                tr3 = abs(lows[i] - closes[i-1])
-                tr_values.append(max(tr1, tr2, tr3))
+            tr_values = np.maximum.reduce([
+                highs[1:] - lows[1:],
+                np.abs(highs[1:] - closes[:-1]),
+                np.abs(lows[1:] - closes[:-1])
+            ])
             
             # Calculate ATR as simple moving average of TR
             atr = np.mean(tr_values[-period:])
             
-            return round(atr, 4)
+            return round(float(atr), 4)
             
         except Exception as e:
             logger.error(f"Error calculating ATR: {e}")
@@ -179,27 +253,12 @@ class TechnicalIndicators:
             Momentum signal: "Strong Bullish", "Bullish", "Neutral", "Bearish", "Strong Bearish"
         """
         try:
-            # RSI thresholds
-            rsi_oversold = 30
-            rsi_overbought = 70
-            rsi_neutral_low = 40
-            rsi_neutral_high = 60
-            
-            # ADX thresholds
-            adx_weak = 20
-            adx_strong = 40
-            
-            # Determine momentum based on RSI and ADX
-            if rsi < rsi_oversold and adx > adx_strong:
-                return "Strong Bullish"
-            elif rsi < rsi_neutral_low and adx > adx_weak:
-                return "Bullish"
-            elif rsi > rsi_overbought and adx > adx_strong:
-                return "Strong Bearish"
-            elif rsi > rsi_neutral_high and adx > adx_weak:
-                return "Bearish"
-            else:
-                return "Neutral"
+            # RSI bucket: <30, 30-40, 40-60, 60-70, >70
+            rsi_bucket = (rsi >= 30) + (rsi >= 40) + (rsi > 60) + (rsi > 70)
+            # ADX bucket: weak (<=20), trending (20-40), strong (>40)
+            adx_bucket = (adx > 20) + (adx > 40)
+            
+            return MOMENTUM_SIGNAL_TABLE[rsi_bucket * 3 + adx_bucket]
                 
         except Exception as e:
             logger.error(f"Error generating momentum signal: {e}")
@@ -249,24 +308,19 @@ class TechnicalIndicators:
             Tuple of (macd_line, signal_line, histogram)
         """
         try:
-            closes = [float(candle[4]) for candle in historical_data]
-            
-            if len(closes) < slow_period:
+            if len(historical_data) < slow_period:
                 return 0.0, 0.0, 0.0
             
-            # Calculate EMAs
-            fast_ema = self._calculate_ema(closes, fast_period)
-            slow_ema = self._calculate_ema(closes, slow_period)
+            closes = self._ohlcv_array(historical_data)[:, 4]
             
-            macd_line = fast_ema - slow_ema
+            # Calculate each EMA series once; the MACD line is the last point
+            fast_series = self._calculate_ema_series(closes, fast_period)
+            slow_series = self._calculate_ema_series(closes, slow_period)
+            macd_series = fast_series - slow_series
             
             # Calculate signal line (EMA of MACD)
-            macd_values = [fast_ema - slow_ema for fast_ema, slow_ema in zip(
-                self._calculate_ema_series(closes, fast_period),
-                self._calculate_ema_series(closes, slow_period)
-            )]
-            
-            signal_line = self._calculate_ema(macd_values, signal_period)
+            macd_line = float(macd_series[-1])
+            signal_line = self._calculate_ema(macd_series, signal_period)
             histogram = macd_line - signal_line
             
             return round(macd_line, 4), round(signal_line, 4), round(histogram, 4)
@@ -278,26 +332,221 @@ class TechnicalIndicators:
     def _calculate_ema(self, prices: List[float], period: int) -> float:
         """Calculate Exponential Moving Average"""
         if len(prices) < period:
-            return prices[-1] if prices else 0.0
+            return float(prices[-1]) if len(prices) else 0.0
         
-        multiplier = 2 / (period + 1)
-        ema = prices[0]
-        
-        for price in prices[1:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-        
-        return ema
+        return float(self._calculate_ema_series(prices, period)[-1])
     
-    def _calculate_ema_series(self, prices: List[float], period: int) -> List[float]:
+    def _calculate_ema_series(self, prices: List[float], period: int) -> np.ndarray:
         """Calculate EMA series for MACD calculation"""
         if len(prices) < period:
-            return prices
+            return np.asarray(prices, dtype=np.float64)
+        
+        # adjust=False gives the recursive form ema = price * k + ema * (1 - k),
+        # seeded with the first price, evaluated in pandas' compiled ewm kernel
+        return pd.Series(prices, dtype=np.float64).ewm(span=period, adjust=False).mean().to_numpy()
+
+
+class BatchIndicators:
+    """
+    Indicators for many symbols at once
+    
+    Histories are stacked into (n_symbols, n_bars) column matrices so each
+    indicator is one set of NumPy operations along axis=1, instead of one
+    TechnicalIndicators call per symbol.
+    """
+    
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._signal_table = np.array(MOMENTUM_SIGNAL_TABLE)
+    
+    @staticmethod
+    def stack(histories: Dict[str, List[List]]) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build SoA matrices from per-symbol candle lists
+        
+        Args:
+            histories: Mapping of symbol to list of [timestamp, low, high, open, close, volume]
+            
+        Returns:
+            Tuple of (symbols, highs, lows, closes); each matrix is a float32
+            (n_symbols, n_bars) array, trimmed to the most recent bars common to
+            every symbol
+        """
+        symbols = list(histories)
+        n_bars = min((len(history) for history in histories.values()), default=0)
+        if not symbols or n_bars == 0:
+            empty = np.empty((len(symbols), 0), dtype=np.float32)
+            return symbols, empty, empty, empty
+        
+        ohlcv = np.asarray([histories[symbol][-n_bars:] for symbol in symbols], dtype=np.float32)
+        highs = np.ascontiguousarray(ohlcv[:, :, 2])
+        lows = np.ascontiguousarray(ohlcv[:, :, 1])
+        closes = np.ascontiguousarray(ohlcv[:, :, 4])
+        return symbols, highs, lows, closes
+    
+    @staticmethod
+    def _true_range(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray) -> np.ndarray:
+        """True range per bar, shape (n_symbols, n_bars - 1)"""
+        return np.maximum.reduce([
+            highs[:, 1:] - lows[:, 1:],
+            np.abs(highs[:, 1:] - closes[:, :-1]),
+            np.abs(lows[:, 1:] - closes[:, :-1])
+        ])
+    
+    def rsi(self, closes: np.ndarray, period: int = None) -> np.ndarray:
+        """Wilder RSI for every row of closes; rows without enough bars get 50"""
+        period = period or self.period
+        n_symbols, n_bars = closes.shape
+        if n_bars < period + 1:
+            return np.full(n_symbols, 50.0)
+        
+        deltas = np.diff(closes, axis=1)
+        gains = np.maximum(deltas, 0.0)
+        losses = np.maximum(-deltas, 0.0)
         
-        multiplier = 2 / (period + 1)
-        ema_series = [prices[0]]
+        # Same unrolled Wilder recurrence as TechnicalIndicators.calculate_rsi,
+        # applied to all rows with one matrix-vector product
+        alpha = 1.0 / period
+        tail = deltas.shape[1] - period
+        decay = (1.0 - alpha) ** np.arange(tail - 1, -1, -1, dtype=np.float64)
+        seed_weight = (1.0 - alpha) ** tail
+        avg_gains = seed_weight * gains[:, :period].mean(axis=1) + alpha * (gains[:, period:] @ decay)
+        avg_losses = seed_weight * losses[:, :period].mean(axis=1) + alpha * (losses[:, period:] @ decay)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100.0 - 100.0 / (1.0 + avg_gains / avg_losses)
+        return np.round(np.where(avg_losses == 0, 100.0, rsi), 2)
+    
+    def atr(self, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, period: int = None) -> np.ndarray:
+        """ATR (simple mean of the last period true ranges) for every row"""
+        period = period or self.period
+        if closes.shape[1] < period + 1:
+            return np.zeros(closes.shape[0])
+        
+        window = slice(-period - 1, None)
+        tr_values = self._true_range(highs[:, window], lows[:, window], closes[:, window])
+        return np.round(tr_values.mean(axis=1), 4)
+    
+    def adx(self, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, period: int = None) -> np.ndarray:
+        """Simplified ADX (single-window DX) for every row, matching calculate_adx"""
+        period = period or self.period
+        if closes.shape[1] < period + 1:
+            return np.full(closes.shape[0], 25.0)
         
-        for price in prices[1:]:
-            ema = (price * multiplier) + (ema_series[-1] * (1 - multiplier))
-            ema_series.append(ema)
+        window = slice(-period - 1, None)
+        highs, lows, closes = highs[:, window], lows[:, window], closes[:, window]
+        atr = self._true_range(highs, lows, closes).mean(axis=1)
         
-        return ema_series
+        high_diff = highs[:, 1:] - highs[:, :-1]
+        low_diff = lows[:, :-1] - lows[:, 1:]
+        dm_plus = np.where((high_diff > low_diff) & (high_diff > 0), high_diff, 0.0)
+        dm_minus = np.where((low_diff > high_diff) & (low_diff > 0), low_diff, 0.0)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            di_plus = dm_plus.mean(axis=1) / atr * 100
+            di_minus = dm_minus.mean(axis=1) / atr * 100
+            dx = np.abs(di_plus - di_minus) / (di_plus + di_minus) * 100
+        # Rows the scalar version would fail on (flat market) fall back to neutral
+        return np.round(np.where(np.isfinite(dx), dx, 25.0), 2)
+    
+    def momentum_signals(self, rsi: np.ndarray, adx: np.ndarray) -> np.ndarray:
+        """Momentum signal per row, using the same buckets as get_momentum_signal"""
+        rsi_bucket = (rsi >= 30).astype(np.intp) + (rsi >= 40) + (rsi > 60) + (rsi > 70)
+        adx_bucket = (adx > 20).astype(np.intp) + (adx > 40)
+        return self._signal_table[rsi_bucket * 3 + adx_bucket]
+    
+    def calculate_all(self, histories: Dict[str, List[List]]) -> Dict[str, Dict]:
+        """
+        Calculate RSI, ADX, ATR and momentum for every symbol in one pass
+        
+        Returns:
+            Mapping of symbol to {"rsi", "adx", "atr", "momentum"}
+        """
+        symbols, highs, lows, closes = self.stack(histories)
+        if _rsi_adx_atr_batch is not None and closes.shape[1] >= self.period + 1:
+            rsi = np.empty(len(symbols))
+            adx = np.empty(len(symbols))
+            atr = np.empty(len(symbols))
+            _rsi_adx_atr_batch(highs, lows, closes, self.period, rsi, adx, atr)
+            rsi, adx, atr = np.round(rsi, 2), np.round(adx, 2), np.round(atr, 4)
+        else:
+            rsi = self.rsi(closes)
+            adx = self.adx(highs, lows, closes)
+            atr = self.atr(highs, lows, closes)
+        momentum = self.momentum_signals(rsi, adx)
+        
+        return {
+            symbol: {
+                "rsi": float(rsi[i]),
+                "adx": float(adx[i]),
+                "atr": float(atr[i]),
+                "momentum": str(momentum[i])
+            }
+            for i, symbol in enumerate(symbols)
+        }
+
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _rsi_wilder(closes, period):
+        """Wilder RSI of one close series (needs period + 1 bars)"""
+        avg_gain = 0.0
+        avg_loss = 0.0
+        for i in range(1, closes.shape[0]):
+            delta = closes[i] - closes[i - 1]
+            gain = delta if delta > 0.0 else 0.0
+            loss = -delta if delta < 0.0 else 0.0
+            if i <= period:
+                # Simple mean seed over the first period changes
+                avg_gain += gain / period
+                avg_loss += loss / period
+            else:
+                avg_gain = (avg_gain * (period - 1) + gain) / period
+                avg_loss = (avg_loss * (period - 1) + loss) / period
+        if avg_loss == 0.0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    
+    @numba.njit(cache=True, fastmath=True)
+    def _atr_adx_window(highs, lows, closes, period):
+        """ATR and simplified ADX over the last period bars; ADX is 25 when undefined"""
+        n_bars = closes.shape[0]
+        tr_sum = 0.0
+        dm_plus = 0.0
+        dm_minus = 0.0
+        for i in range(n_bars - period, n_bars):
+            tr_sum += max(
+                highs[i] - lows[i],
+                abs(highs[i] - closes[i - 1]),
+                abs(lows[i] - closes[i - 1])
+            )
+            high_diff = highs[i] - highs[i - 1]
+            low_diff = lows[i - 1] - lows[i]
+            if high_diff > low_diff and high_diff > 0.0:
+                dm_plus += high_diff
+            if low_diff > high_diff and low_diff > 0.0:
+                dm_minus += low_diff
+        
+        atr = tr_sum / period
+        if atr == 0.0 or dm_plus + dm_minus == 0.0:
+            return atr, 25.0
+        di_plus = dm_plus / period / atr * 100.0
+        di_minus = dm_minus / period / atr * 100.0
+        return atr, abs(di_plus - di_minus) / (di_plus + di_minus) * 100.0
+    
+    @numba.njit(cache=True, fastmath=True, parallel=True)
+    def _rsi_adx_atr_batch(highs, lows, closes, period, out_rsi, out_adx, out_atr):
+        """
+        Fused RSI/ADX/ATR kernel, one row per symbol
+        
+        Each row is walked with running scalars (no intermediate arrays) and
+        rows are spread across cores with prange. Results match the NumPy
+        BatchIndicators methods before rounding; rows need period + 1 bars.
+        """
+        for s in numba.prange(closes.shape[0]):
+            out_rsi[s] = _rsi_wilder(closes[s], period)
+            out_atr[s], out_adx[s] = _atr_adx_window(highs[s], lows[s], closes[s], period)
+else:
+    _rsi_wilder = None
+    _atr_adx_window = None
+    _rsi_adx_atr_batch = None
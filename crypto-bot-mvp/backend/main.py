@@ -6,13 +6,16 @@ Provides REST endpoints and WebSocket streaming for real-time crypto data
 import asyncio
 import json
 import logging
+import time
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple, Type
 
 import aiohttp
-import redis
+from redis import asyncio as aioredis
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 
 from indicators import TechnicalIndicators
@@ -20,9 +23,22 @@ from sentiment import SentimentAnalyzer
 from risk import RiskManager
 from strategy import TradingStrategy
 from redis_logger import RedisLogger
-from hybrid_integration import hybrid_manager, clojure_config
+from hybrid_integration import hybrid_manager, clojure_config, create_http_session
 from config import config
 
+try:
+    import orjson
+    
+    def _dumps(data) -> str:
+        return orjson.dumps(data, default=str, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    
+    _response_class = ORJSONResponse
+except ImportError:
+    def _dumps(data) -> str:
+        return json.dumps(data, default=str)
+    
+    _response_class = JSONResponse
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -33,7 +49,12 @@ COINBASE_WS_URL = "wss://ws-feed.exchange.coinbase.com"
 REDIS_URL = config.REDIS_URL
 
 # Initialize FastAPI app
-app = FastAPI(title="Crypto Trading Bot Dashboard", version="1.0.0")
+# REST responses are rendered with orjson when it is installed
+app = FastAPI(
+    title="Crypto Trading Bot Dashboard",
+    version="1.0.0",
+    default_response_class=_response_class
+)
 
 # Add CORS middleware
 app.add_middleware(
@@ -45,7 +66,7 @@ app.add_middleware(
 )
 
 # Initialize components
-redis_client = redis.from_url(REDIS_URL)
+redis_client = aioredis.from_url(REDIS_URL)
 indicators = TechnicalIndicators()
 sentiment_analyzer = SentimentAnalyzer()
 risk_manager = RiskManager()
@@ -54,26 +75,59 @@ redis_logger = RedisLogger(redis_client)
 
 # WebSocket connection manager
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    """
+    Tracks WebSocket clients, each with its own bounded send queue
+    
+    broadcast() only enqueues; a writer task per client does the actual
+    send, so one slow client never holds up the others. When a client's
+    queue is full its oldest pending message is dropped in favour of the
+    newest market update.
+    """
+    
+    def __init__(self, max_queue: int = 16, yield_every: int = 50):
+        self.active_connections: Set[WebSocket] = set()
+        self.max_queue = max_queue
+        self.yield_every = yield_every
+        self._queues: Dict[WebSocket, asyncio.Queue] = {}
+        self._writers: Dict[WebSocket, asyncio.Task] = {}
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
+        queue = asyncio.Queue(maxsize=self.max_queue)
+        self._queues[websocket] = queue
+        self._writers[websocket] = asyncio.create_task(self._writer(websocket, queue))
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        if self._queues.pop(websocket, None) is None:
+            return
+        self.active_connections.discard(websocket)
+        writer = self._writers.pop(websocket)
+        if writer is not asyncio.current_task():
+            writer.cancel()
+
+    async def _writer(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Send queued messages to one client until it goes away"""
+        try:
+            while True:
+                message = await queue.get()
+                await websocket.send_text(message)
+        except Exception:
+            # Remove disconnected connections
+            self.disconnect(websocket)
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
         await websocket.send_text(message)
 
     async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except:
-                # Remove disconnected connections
-                self.active_connections.remove(connection)
+        """Queue one message (shared by reference) for every client"""
+        for i, queue in enumerate(list(self._queues.values()), 1):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+            # Let writers run between chunks of a large fan-out
+            if i % self.yield_every == 0:
+                await asyncio.sleep(0)
 
 manager = ConnectionManager()
 
@@ -175,14 +229,58 @@ async def get_price(symbol: str = "BTC-USD"):
     try:
         price_data = await get_coinbase_price(symbol)
         
-        # Log to Redis
-        await redis_logger.log_price(price_data)
+        # Log to Redis (written in the background)
+        redis_logger.enqueue('price', price_data)
         
         return PriceResponse(**price_data)
     except Exception as e:
         logger.error(f"Error in get_price: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+CANDLE_FIELDS = ("low", "high", "open", "close", "volume")
+
+def _candle_rows(historical_data: List) -> List[List[float]]:
+    """
+    History as [timestamp, low, high, open, close, volume] rows
+    
+    The hybrid sources return dict candles with ISO timestamps;
+    TechnicalIndicators (and its result cache) expects numeric list rows.
+    """
+    if not isinstance(historical_data[0], dict):
+        return historical_data
+    
+    rows = []
+    for candle in historical_data:
+        ts = candle.get("timestamp", 0)
+        if isinstance(ts, str):
+            # Only part of the cache key; the indicators never read it
+            try:
+                ts = datetime.fromisoformat(ts).timestamp()
+            except ValueError:
+                ts = 0
+        rows.append([float(ts), *(float(candle[field]) for field in CANDLE_FIELDS)])
+    return rows
+
+def compute_indicators(historical_data: List) -> Dict:
+    """Calculate RSI, ADX, ATR and momentum for a price history"""
+    if not historical_data:
+        raise HTTPException(status_code=400, detail="No historical data available")
+    
+    # Converted once so all three indicators share the rows and their cache
+    historical_data = _candle_rows(historical_data)
+    rsi = indicators.calculate_rsi(historical_data)
+    adx = indicators.calculate_adx(historical_data)
+    atr = indicators.calculate_atr(historical_data)
+    momentum_signal = indicators.get_momentum_signal(rsi, adx)
+    
+    return {
+        "rsi": rsi,
+        "adx": adx,
+        "atr": atr,
+        "momentum_signal": momentum_signal,
+        "timestamp": datetime.now()
+    }
+
 @app.get("/indicators", response_model=IndicatorsResponse)
 async def get_indicators(symbol: str = "BTC-USD"):
     """Get technical indicators for a trading pair"""
@@ -190,25 +288,11 @@ async def get_indicators(symbol: str = "BTC-USD"):
         # Fetch historical data
         historical_data = await get_coinbase_historical_data(symbol)
         
-        if not historical_data:
-            raise HTTPException(status_code=400, detail="No historical data available")
-        
         # Calculate indicators
-        rsi = indicators.calculate_rsi(historical_data)
-        adx = indicators.calculate_adx(historical_data)
-        atr = indicators.calculate_atr(historical_data)
-        momentum_signal = indicators.get_momentum_signal(rsi, adx)
+        result = compute_indicators(historical_data)
         
-        result = {
-            "rsi": rsi,
-            "adx": adx,
-            "atr": atr,
-            "momentum_signal": momentum_signal,
-            "timestamp": datetime.now()
-        }
-        
-        # Log to Redis
-        await redis_logger.log_indicators(result)
+        # Log to Redis (written in the background)
+        redis_logger.enqueue('indicators', result)
         
         return IndicatorsResponse(**result)
     except Exception as e:
@@ -221,40 +305,99 @@ async def get_sentiment():
     try:
         sentiment_data = await sentiment_analyzer.analyze_crypto_sentiment()
         
-        # Log to Redis
-        await redis_logger.log_sentiment(sentiment_data)
+        # Log to Redis (written in the background)
+        redis_logger.enqueue('sentiment', sentiment_data)
         
         return SentimentResponse(**sentiment_data)
     except Exception as e:
         logger.error(f"Error in get_sentiment: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Market snapshot shared by /signal, /risk and the WebSocket stream
+@dataclass
+class MarketSnapshot:
+    """Plain dicts; REST endpoints validate them through their response_model"""
+    price: Dict
+    indicators: Dict
+    sentiment: Dict
+    signal: Dict
+    risk: Dict
+
+def _model_fields(model: Type[BaseModel], data: Dict) -> Dict:
+    """The subset of data that model exposes, without running validation"""
+    return {name: data[name] for name in model.model_fields}
+
+SNAPSHOT_TTL = 1.0  # seconds a snapshot is reused
+_snapshots: Dict[str, Tuple[float, asyncio.Task]] = {}
+
+async def _compute_snapshot(symbol: str) -> MarketSnapshot:
+    """Fetch price, history and sentiment once and derive everything else from them"""
+    # The three upstream fetches are independent: wait for the slowest, not the sum
+    price_data, historical_data, sentiment_data = await asyncio.gather(
+        get_coinbase_price(symbol),
+        get_coinbase_historical_data(symbol),
+        sentiment_analyzer.analyze_crypto_sentiment()
+    )
+    
+    indicators_data = compute_indicators(historical_data)
+    
+    signal_data = trading_strategy.generate_signal(
+        price_data["price"],
+        indicators_data["rsi"],
+        indicators_data["adx"],
+        indicators_data["atr"],
+        sentiment_data["score"]
+    )
+    
+    risk_data = risk_manager.calculate_risk_controls(
+        price_data["price"],
+        indicators_data["atr"]
+    ).as_dict()
+    
+    # Log to Redis (written in the background)
+    redis_logger.enqueue('price', price_data)
+    redis_logger.enqueue('indicators', indicators_data)
+    redis_logger.enqueue('sentiment', sentiment_data)
+    redis_logger.enqueue('signal', signal_data)
+    redis_logger.enqueue('risk', risk_data)
+    
+    return MarketSnapshot(
+        price=price_data,
+        indicators=_model_fields(IndicatorsResponse, indicators_data),
+        sentiment=_model_fields(SentimentResponse, sentiment_data),
+        signal=_model_fields(SignalResponse, signal_data),
+        risk=_model_fields(RiskResponse, risk_data)
+    )
+
+async def get_snapshot(symbol: str = "BTC-USD") -> MarketSnapshot:
+    """
+    Get the market snapshot for a symbol
+    
+    Snapshots are computed at most once per SNAPSHOT_TTL; concurrent callers
+    share the in-flight computation, and a failed or cancelled one is retried
+    right away.
+    """
+    now = time.monotonic()
+    cached = _snapshots.get(symbol)
+    if cached is not None and cached[1].done():
+        # cancelled() first: exception() raises CancelledError on a cancelled task
+        task = cached[1]
+        if task.cancelled() or task.exception() is not None:
+            del _snapshots[symbol]
+            cached = None
+    if cached is None or now - cached[0] >= SNAPSHOT_TTL:
+        cached = (now, asyncio.create_task(_compute_snapshot(symbol)))
+        _snapshots[symbol] = cached
+    
+    # Shielded so one cancelled caller does not cancel the shared computation
+    return await asyncio.shield(cached[1])
+
 @app.get("/signal", response_model=SignalResponse)
 async def get_trading_signal(symbol: str = "BTC-USD"):
     """Get trading signal based on indicators and sentiment"""
     try:
-        # Get current price
-        price_data = await get_coinbase_price(symbol)
-        
-        # Get indicators
-        indicators_data = await get_indicators(symbol)
-        
-        # Get sentiment
-        sentiment_data = await get_sentiment()
-        
-        # Generate trading signal
-        signal_data = trading_strategy.generate_signal(
-            price_data["price"],
-            indicators_data.rsi,
-            indicators_data.adx,
-            indicators_data.atr,
-            sentiment_data.score
-        )
-        
-        # Log to Redis
-        await redis_logger.log_signal(signal_data)
-        
-        return SignalResponse(**signal_data)
+        snapshot = await get_snapshot(symbol)
+        return snapshot.signal
     except Exception as e:
         logger.error(f"Error in get_trading_signal: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -263,57 +406,55 @@ async def get_trading_signal(symbol: str = "BTC-USD"):
 async def get_risk_controls(symbol: str = "BTC-USD"):
     """Get risk management controls"""
     try:
-        # Get current price
-        price_data = await get_coinbase_price(symbol)
-        
-        # Get indicators for ATR
-        indicators_data = await get_indicators(symbol)
-        
-        # Calculate risk controls
-        risk_data = risk_manager.calculate_risk_controls(
-            price_data["price"],
-            indicators_data.atr
-        )
-        
-        # Log to Redis
-        await redis_logger.log_risk(risk_data)
-        
-        return RiskResponse(**risk_data)
+        snapshot = await get_snapshot(symbol)
+        return snapshot.risk
     except Exception as e:
         logger.error(f"Error in get_risk_controls: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def market_update_payload() -> str:
+    """Serialized market_update message for the current snapshot"""
+    snapshot = await get_snapshot()
+    
+    # Combine all data
+    combined_data = {
+        "type": "market_update",
+        "data": {
+            "price": snapshot.price,
+            "indicators": snapshot.indicators,
+            "sentiment": snapshot.sentiment,
+            "signal": snapshot.signal,
+            "risk": snapshot.risk
+        },
+        "timestamp": datetime.now().isoformat()
+    }
+    
+    return _dumps(combined_data)
+
+async def stream_market_updates():
+    """Serialize one market update per tick and broadcast it to every client"""
+    while True:
+        if manager.active_connections:
+            try:
+                await manager.broadcast(await market_update_payload())
+            except Exception as e:
+                logger.error(f"Error streaming market update: {e}")
+        
+        # Wait 5 seconds before next update
+        await asyncio.sleep(5)
+
 # WebSocket endpoint
 @app.websocket("/stream")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time data streaming"""
     await manager.connect(websocket)
     try:
+        # First update right away; later ones arrive through the broadcaster
+        await manager.send_personal_message(await market_update_payload(), websocket)
+        
+        # Nothing is expected from the client; this just waits for it to leave
         while True:
-            # Send periodic updates
-            price_data = await get_coinbase_price()
-            indicators_data = await get_indicators()
-            sentiment_data = await get_sentiment()
-            signal_data = await get_trading_signal()
-            risk_data = await get_risk_controls()
-            
-            # Combine all data
-            combined_data = {
-                "type": "market_update",
-                "data": {
-                    "price": price_data,
-                    "indicators": indicators_data.dict(),
-                    "sentiment": sentiment_data.dict(),
-                    "signal": signal_data.dict(),
-                    "risk": risk_data.dict()
-                },
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            await manager.send_personal_message(json.dumps(combined_data), websocket)
-            
-            # Wait 5 seconds before next update
-            await asyncio.sleep(5)
+            await websocket.receive_text()
             
     except WebSocketDisconnect:
         manager.disconnect(websocket)
@@ -327,7 +468,7 @@ async def startup_event():
     
     # Test Redis connection
     try:
-        redis_client.ping()
+        await redis_client.ping()
         logger.info("Redis connection established")
     except Exception as e:
         logger.error(f"Redis connection failed: {e}")
@@ -335,7 +476,38 @@ async def startup_event():
     # Initialize sentiment analyzer
     await sentiment_analyzer.initialize()
     logger.info("Sentiment analyzer initialized")
+    
+    # One upstream HTTP session for the whole app, shared with the hybrid manager
+    app.state.http = create_http_session()
+    await hybrid_manager.startup(app.state.http)
+    
+    # Start the background Redis/file log writer
+    await redis_logger.start()
+    
+    # Start the WebSocket broadcaster
+    app.state.stream_task = asyncio.create_task(stream_market_updates())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release shared resources on shutdown"""
+    app.state.stream_task.cancel()
+    await redis_logger.stop()
+    await hybrid_manager.close()
+    await app.state.http.close()
+    await redis_client.close()
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    # loop/http "auto" pick uvloop and httptools when installed (uvicorn[standard],
+    # not on Windows). Clients only send small control messages, so inbound
+    # frames are capped well below the 16 MiB default. reload needs an import
+    # string, so it is left to the uvicorn CLI (uvicorn main:app --reload)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="auto",
+        ws="websockets",
+        ws_max_size=65536
+    )
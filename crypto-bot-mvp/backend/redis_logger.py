@@ -6,33 +6,79 @@ Handles logging of trades, market data, and system events
 import json
 import logging
 import os
-from datetime import datetime
-from typing import Dict, List, Optional
-import redis
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import time
+from typing import Dict, List, Optional, Tuple
+from redis import asyncio as aioredis
 import asyncio
 
+try:
+    import orjson
+    _loads = orjson.loads
+    
+    def _dumps(data, indent: bool = False) -> bytes:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, default=str, option=option)
+except ImportError:
+    _loads = json.loads
+    
+    def _dumps(data, indent: bool = False) -> bytes:
+        return json.dumps(data, default=str, indent=2 if indent else None).encode()
+
 logger = logging.getLogger(__name__)
 
+def _write_backups(data_dir: str, snapshot: Dict[str, List[Dict]]):
+    """Write one <data_type>_backup.json per entry; runs in RedisLogger's backup process"""
+    for data_type, data in snapshot.items():
+        filepath = os.path.join(data_dir, f"{data_type}_backup.json")
+        with open(filepath, 'wb') as f:
+            f.write(_dumps(data, indent=True))
+
 class RedisLogger:
     """Redis-based logging and data persistence for crypto trading bot"""
     
-    def __init__(self, redis_client: redis.Redis):
+    def __init__(self, redis_client: aioredis.Redis):
         self.redis_client = redis_client
         self.data_dir = "data"
         self._ensure_data_directory()
         
-        # Redis key prefixes
-        self.PRICE_PREFIX = "price:"
-        self.INDICATORS_PREFIX = "indicators:"
-        self.SENTIMENT_PREFIX = "sentiment:"
-        self.SIGNAL_PREFIX = "signal:"
-        self.RISK_PREFIX = "risk:"
-        self.TRADE_PREFIX = "trade:"
-        self.ALERT_PREFIX = "alert:"
+        # One Redis Stream per data type, e.g. "stream:price"
+        self.STREAM_PREFIX = "stream:"
+        
+        # data_type -> (retention seconds, local file, trimmed to max_redis_entries)
+        self._log_specs = {
+            'price': (86400, "prices.ndjson", True),
+            'indicators': (86400, "indicators.ndjson", True),
+            'sentiment': (86400, "sentiment.ndjson", True),
+            'signal': (86400, "signals.ndjson", True),
+            'risk': (86400, "risk.ndjson", True),
+            'trade': (604800, "trades.ndjson", False),
+            'alert': (86400, "alerts.ndjson", False)
+        }
         
         # Data retention settings
         self.max_redis_entries = 1000
+        self.max_file_entries = 1000
         self.backup_interval = 300  # 5 minutes
+        self._file_writes: Dict[str, int] = {}
+        
+        # File writes run here instead of on the event loop; a single worker
+        # keeps appends to the same file in order
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="redis-logger-io")
+        
+        # Backups serialize thousands of records, so they get their own process
+        # (created on first backup) rather than holding the GIL on the I/O thread
+        self._backup_pool: Optional[ProcessPoolExecutor] = None
+        
+        # Write-behind queue drained by the background worker (see enqueue)
+        self.flush_interval = 0.1  # seconds
+        self.max_batch_size = 500
+        self.max_queue_size = 10000
+        # Created in start(), on the running loop (on Python 3.9 a Queue binds
+        # to the loop current at construction, and this object is built at import)
+        self.queue: Optional[asyncio.Queue] = None
+        self._worker_task: Optional[asyncio.Task] = None
         
     def _ensure_data_directory(self):
         """Ensure data directory exists"""
@@ -51,21 +97,17 @@ class RedisLogger:
             Success status
         """
         try:
-            timestamp = datetime.now()
-            key = f"{self.PRICE_PREFIX}{price_data['symbol']}:{timestamp.isoformat()}"
+            timestamp = time.time_ns()
             
             # Add timestamp if not present
             if 'timestamp' not in price_data:
                 price_data['timestamp'] = timestamp
             
-            # Store in Redis
-            self.redis_client.setex(key, 86400, json.dumps(price_data, default=str))  # 24 hour TTL
+            # Append to the Redis stream, capped at max_redis_entries
+            await self._store([('price', price_data)])
             
             # Store in local file
-            await self._append_to_file("prices.json", price_data)
-            
-            # Cleanup old entries
-            await self._cleanup_old_entries(self.PRICE_PREFIX)
+            await self._append_to_file("prices.ndjson", price_data)
             
             logger.debug(f"Logged price data for {price_data['symbol']}")
             return True
@@ -85,21 +127,17 @@ class RedisLogger:
             Success status
         """
         try:
-            timestamp = datetime.now()
-            key = f"{self.INDICATORS_PREFIX}{timestamp.isoformat()}"
+            timestamp = time.time_ns()
             
             # Add timestamp if not present
             if 'timestamp' not in indicators_data:
                 indicators_data['timestamp'] = timestamp
             
-            # Store in Redis
-            self.redis_client.setex(key, 86400, json.dumps(indicators_data, default=str))
+            # Append to the Redis stream, capped at max_redis_entries
+            await self._store([('indicators', indicators_data)])
             
             # Store in local file
-            await self._append_to_file("indicators.json", indicators_data)
-            
-            # Cleanup old entries
-            await self._cleanup_old_entries(self.INDICATORS_PREFIX)
+            await self._append_to_file("indicators.ndjson", indicators_data)
             
             logger.debug("Logged indicators data")
             return True
@@ -119,21 +157,17 @@ class RedisLogger:
             Success status
         """
         try:
-            timestamp = datetime.now()
-            key = f"{self.SENTIMENT_PREFIX}{timestamp.isoformat()}"
+            timestamp = time.time_ns()
             
             # Add timestamp if not present
             if 'timestamp' not in sentiment_data:
                 sentiment_data['timestamp'] = timestamp
             
-            # Store in Redis
-            self.redis_client.setex(key, 86400, json.dumps(sentiment_data, default=str))
+            # Append to the Redis stream, capped at max_redis_entries
+            await self._store([('sentiment', sentiment_data)])
             
             # Store in local file
-            await self._append_to_file("sentiment.json", sentiment_data)
-            
-            # Cleanup old entries
-            await self._cleanup_old_entries(self.SENTIMENT_PREFIX)
+            await self._append_to_file("sentiment.ndjson", sentiment_data)
             
             logger.debug("Logged sentiment data")
             return True
@@ -153,21 +187,17 @@ class RedisLogger:
             Success status
         """
         try:
-            timestamp = datetime.now()
-            key = f"{self.SIGNAL_PREFIX}{timestamp.isoformat()}"
+            timestamp = time.time_ns()
             
             # Add timestamp if not present
             if 'timestamp' not in signal_data:
                 signal_data['timestamp'] = timestamp
             
-            # Store in Redis
-            self.redis_client.setex(key, 86400, json.dumps(signal_data, default=str))
+            # Append to the Redis stream, capped at max_redis_entries
+            await self._store([('signal', signal_data)])
             
             # Store in local file
-            await self._append_to_file("signals.json", signal_data)
-            
-            # Cleanup old entries
-            await self._cleanup_old_entries(self.SIGNAL_PREFIX)
+            await self._append_to_file("signals.ndjson", signal_data)
             
             logger.debug(f"Logged signal: {signal_data.get('signal', 'UNKNOWN')}")
             return True
@@ -187,21 +217,17 @@ class RedisLogger:
             Success status
         """
         try:
-            timestamp = datetime.now()
-            key = f"{self.RISK_PREFIX}{timestamp.isoformat()}"
+            timestamp = time.time_ns()
             
             # Add timestamp if not present
             if 'timestamp' not in risk_data:
                 risk_data['timestamp'] = timestamp
             
-            # Store in Redis
-            self.redis_client.setex(key, 86400, json.dumps(risk_data, default=str))
+            # Append to the Redis stream, capped at max_redis_entries
+            await self._store([('risk', risk_data)])
             
             # Store in local file
-            await self._append_to_file("risk.json", risk_data)
-            
-            # Cleanup old entries
-            await self._cleanup_old_entries(self.RISK_PREFIX)
+            await self._append_to_file("risk.ndjson", risk_data)
             
             logger.debug("Logged risk data")
             return True
@@ -221,19 +247,18 @@ class RedisLogger:
             Success status
         """
         try:
-            timestamp = datetime.now()
-            trade_id = trade_data.get('trade_id', f"trade_{timestamp.isoformat()}")
-            key = f"{self.TRADE_PREFIX}{trade_id}"
+            timestamp = time.time_ns()
+            trade_id = trade_data.get('trade_id', f"trade_{timestamp}")
             
             # Add timestamp if not present
             if 'timestamp' not in trade_data:
                 trade_data['timestamp'] = timestamp
             
-            # Store in Redis
-            self.redis_client.setex(key, 604800, json.dumps(trade_data, default=str))  # 7 day TTL
+            # Append to the Redis stream (kept for 7 days)
+            await self._store([('trade', trade_data)])
             
             # Store in local file
-            await self._append_to_file("trades.json", trade_data)
+            await self._append_to_file("trades.ndjson", trade_data)
             
             logger.info(f"Logged trade: {trade_id}")
             return True
@@ -253,18 +278,17 @@ class RedisLogger:
             Success status
         """
         try:
-            timestamp = datetime.now()
-            key = f"{self.ALERT_PREFIX}{timestamp.isoformat()}"
+            timestamp = time.time_ns()
             
             # Add timestamp if not present
             if 'timestamp' not in alert_data:
                 alert_data['timestamp'] = timestamp
             
-            # Store in Redis
-            self.redis_client.setex(key, 86400, json.dumps(alert_data, default=str))
+            # Append to the Redis stream (kept for 24 hours)
+            await self._store([('alert', alert_data)])
             
             # Store in local file
-            await self._append_to_file("alerts.json", alert_data)
+            await self._append_to_file("alerts.ndjson", alert_data)
             
             logger.info(f"Alert logged: {alert_data.get('message', 'Unknown alert')}")
             return True
@@ -274,63 +298,194 @@ class RedisLogger:
             return False
     
     async def _append_to_file(self, filename: str, data: Dict):
-        """Append data to local JSON file"""
+        """
+        Append data to a local NDJSON file (one JSON object per line)
+        
+        Appends are O(1); every max_file_entries writes the file is trimmed
+        back to its last max_file_entries lines.
+        """
         try:
-            filepath = os.path.join(self.data_dir, filename)
-            
-            # Read existing data
-            if os.path.exists(filepath):
-                with open(filepath, 'r') as f:
-                    try:
-                        existing_data = json.load(f)
-                    except json.JSONDecodeError:
-                        existing_data = []
-            else:
-                existing_data = []
-            
-            # Append new data
-            existing_data.append(data)
-            
-            # Keep only last 1000 entries
-            if len(existing_data) > 1000:
-                existing_data = existing_data[-1000:]
-            
-            # Write back to file
-            with open(filepath, 'w') as f:
-                json.dump(existing_data, f, indent=2, default=str)
-                
+            line = _dumps(data) + b"\n"
+            await asyncio.get_running_loop().run_in_executor(
+                self._io_pool, self._append_line, filename, line
+            )
         except Exception as e:
             logger.error(f"Error appending to file {filename}: {e}")
     
-    async def _cleanup_old_entries(self, prefix: str):
-        """Cleanup old Redis entries to prevent memory issues"""
+    def _append_line(self, filename: str, line: bytes):
+        """Blocking part of _append_to_file, run on the I/O thread"""
+        filepath = os.path.join(self.data_dir, filename)
+        
+        with open(filepath, 'ab') as f:
+            f.write(line)
+        
+        writes = self._file_writes.get(filename, 0) + 1
+        if writes >= self.max_file_entries:
+            self._trim_file(filepath)
+            writes = 0
+        self._file_writes[filename] = writes
+    
+    def _trim_file(self, filepath: str):
+        """Keep only the last max_file_entries lines of an NDJSON file"""
+        with open(filepath, 'rb') as f:
+            lines = deque(f, maxlen=self.max_file_entries)
+        
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.writelines(lines)
+        os.replace(tmp_path, filepath)
+    
+    async def _store(self, records: List[Tuple[str, Dict]]):
+        """
+        Append records to their Redis streams in one pipeline
+        
+        Trimmed streams are capped at about max_redis_entries entries; the
+        others drop entries older than their retention period. Entry IDs are
+        millisecond timestamps, so both trims happen inside XADD (approximate,
+        whole macro-nodes at a time) with no separate cleanup.
+        
+        Args:
+            records: (data_type, data) tuples
+        """
+        now_ms = int(time.time() * 1000)
+        pipe = self.redis_client.pipeline(transaction=False)
+        for data_type, data in records:
+            retention, _, trimmed = self._log_specs[data_type]
+            fields = {"json": _dumps(data)}
+            if trimmed:
+                pipe.xadd(self._stream_key(data_type), fields,
+                          maxlen=self.max_redis_entries, approximate=True)
+            else:
+                pipe.xadd(self._stream_key(data_type), fields,
+                          minid=now_ms - retention * 1000, approximate=True)
+        await pipe.execute()
+    
+    def _stream_key(self, data_type: str) -> str:
+        """Redis stream holding a data type's records"""
+        return f"{self.STREAM_PREFIX}{data_type}"
+    
+    async def log_many(self, records: List[Tuple]) -> bool:
+        """
+        Log several records of any type with a single Redis pipeline
+        
+        Args:
+            records: (data_type, data) or (data_type, data, timestamp) tuples,
+                data_type as in get_recent_data (trade and alert records are
+                kept by age rather than count, like log_trade/log_alert);
+                timestamp is epoch nanoseconds, used when data has none
+            
+        Returns:
+            Success status
+        """
         try:
-            # Get all keys with prefix
-            keys = self.redis_client.keys(f"{prefix}*")
-            
-            if len(keys) > self.max_redis_entries:
-                # Sort by timestamp and remove oldest entries
-                keys_with_timestamps = []
-                for key in keys:
-                    try:
-                        # Extract timestamp from key
-                        timestamp_str = key.decode('utf-8').split(':')[-1]
-                        timestamp = datetime.fromisoformat(timestamp_str)
-                        keys_with_timestamps.append((timestamp, key))
-                    except:
-                        continue
-                
-                # Sort by timestamp and remove oldest
-                keys_with_timestamps.sort(key=lambda x: x[0])
-                keys_to_remove = keys_with_timestamps[:-self.max_redis_entries]
-                
-                for _, key in keys_to_remove:
-                    self.redis_client.delete(key)
+            batch = []
+            files = []
+            
+            for data_type, data, *logged_at in records:
+                timestamp = logged_at[0] if logged_at else time.time_ns()
+                _, filename, _ = self._log_specs[data_type]
                 
-                logger.debug(f"Cleaned up {len(keys_to_remove)} old entries for {prefix}")
+                # Add timestamp if not present
+                if 'timestamp' not in data:
+                    data['timestamp'] = timestamp
                 
+                batch.append((data_type, data))
+                files.append((filename, data))
+            
+            await self._store(batch)
+            
+            for filename, data in files:
+                await self._append_to_file(filename, data)
+            
+            logger.debug(f"Logged batch of {len(records)} records")
+            return True
+            
         except Exception as e:
-            logger.error(f"Error cleaning up old entries: {e}")
+            logger.error(f"Error logging batch: {e}")
+            return False
+    
+    def enqueue(self, data_type: str, data: Dict) -> bool:
+        """
+        Queue a record for the background writer and return immediately
+        
+        Args:
+            data_type: Type of data, as accepted by log_many
+            data: Data dictionary
+            
+        Returns:
+            False if the writer is not started or the queue is full and the
+            record was dropped
+        """
+        if self.queue is None:
+            logger.warning(f"Log writer not started, dropping {data_type} record")
+            return False
+        try:
+            self.queue.put_nowait((data_type, data, time.time_ns()))
+            return True
+        except asyncio.QueueFull:
+            logger.warning(f"Log queue full, dropping {data_type} record")
+            return False
+    
+    async def start(self):
+        """Start the background writer"""
+        if self.queue is None:
+            self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+        if self._worker_task is None or self._worker_task.done():
+            self._worker_task = asyncio.create_task(self._log_worker())
+    
+    async def stop(self):
+        """Stop the background writer and flush anything still queued"""
+        if self._worker_task is not None:
+            # A None sentinel rather than cancel(): the worker writes the batch
+            # it has already dequeued before it exits
+            if not self._worker_task.done():
+                await self.queue.put(None)
+            try:
+                await self._worker_task
+            except Exception as e:
+                logger.error(f"Log writer failed: {e}")
+            self._worker_task = None
+        
+        if self._backup_pool is not None:
+            self._backup_pool.shutdown(wait=False)
+            self._backup_pool = None
+        
+        batch = []
+        while self.queue is not None and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        if batch:
+            await self.log_many(batch)
+    
+    async def _log_worker(self):
+        """
+        Drain the queue in batches: up to max_batch_size records or flush_interval seconds
+        
+        Returns after writing the current batch once it dequeues the None
+        sentinel put by stop().
+        """
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            record = await self.queue.get()
+            if record is None:
+                return
+            batch = [record]
+            deadline = loop.time() + self.flush_interval
+            
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    record = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if record is None:
+                    stopping = True
+                    break
+                batch.append(record)
+            
+            await self.log_many(batch)
     
     async def get_recent_data(self, data_type: str, limit: int = 100) -> List[Dict]:
         """
@@ -344,41 +499,16 @@ class RedisLogger:
             List of data dictionaries
         """
         try:
-            prefix_map = {
-                'price': self.PRICE_PREFIX,
-                'indicators': self.INDICATORS_PREFIX,
-                'sentiment': self.SENTIMENT_PREFIX,
-                'signal': self.SIGNAL_PREFIX,
-                'risk': self.RISK_PREFIX,
-                'trade': self.TRADE_PREFIX,
-                'alert': self.ALERT_PREFIX
-            }
-            
-            if data_type not in prefix_map:
+            if data_type not in self._log_specs:
                 raise ValueError(f"Invalid data type: {data_type}")
             
-            prefix = prefix_map[data_type]
-            keys = self.redis_client.keys(f"{prefix}*")
+            # Newest first, straight from the stream
+            entries = await self.redis_client.xrevrange(self._stream_key(data_type), count=limit)
             
-            # Sort keys by timestamp (newest first)
-            keys_with_timestamps = []
-            for key in keys:
-                try:
-                    timestamp_str = key.decode('utf-8').split(':')[-1]
-                    timestamp = datetime.fromisoformat(timestamp_str)
-                    keys_with_timestamps.append((timestamp, key))
-                except:
-                    continue
-            
-            keys_with_timestamps.sort(key=lambda x: x[0], reverse=True)
-            
-            # Get data for recent keys
             recent_data = []
-            for _, key in keys_with_timestamps[:limit]:
+            for _, fields in entries:
                 try:
-                    data = self.redis_client.get(key)
-                    if data:
-                        recent_data.append(json.loads(data))
+                    recent_data.append(_loads(fields[b"json"]))
                 except:
                     continue
             
@@ -393,22 +523,28 @@ class RedisLogger:
         try:
             data_types = ['price', 'indicators', 'sentiment', 'signal', 'risk', 'trade', 'alert']
             
+            snapshot = {}
             for data_type in data_types:
                 data = await self.get_recent_data(data_type, 1000)
                 if data:
-                    filepath = os.path.join(self.data_dir, f"{data_type}_backup.json")
-                    with open(filepath, 'w') as f:
-                        json.dump(data, f, indent=2, default=str)
+                    snapshot[data_type] = data
+            
+            if snapshot:
+                if self._backup_pool is None:
+                    self._backup_pool = ProcessPoolExecutor(max_workers=1)
+                await asyncio.get_running_loop().run_in_executor(
+                    self._backup_pool, _write_backups, self.data_dir, snapshot
+                )
             
             logger.info("Data backup completed")
             
         except Exception as e:
             logger.error(f"Error backing up data: {e}")
     
-    def get_redis_status(self) -> Dict:
+    async def get_redis_status(self) -> Dict:
         """Get Redis connection status and info"""
         try:
-            info = self.redis_client.info()
+            info = await self.redis_client.info()
             return {
                 "connected": True,
                 "redis_version": info.get('redis_version', 'Unknown'),
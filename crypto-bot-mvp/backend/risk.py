@@ -4,12 +4,138 @@ Implements ATR-based position sizing and stop-loss calculations
 """
 
 import logging
+import math
+import operator
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Tuple
+from typing import Dict, NamedTuple, Optional, Tuple, Union
 import numpy as np
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
 logger = logging.getLogger(__name__)
 
+# (risk_amount, position_value) of a position dict
+_RISK_FIELDS = operator.itemgetter('risk_amount', 'position_value')
+
+# validate_risk_parameters checks as (bit, is_error, message), in reporting order
+_RISK_CHECKS = (
+    (1, True, "Position size must be positive"),
+    (2, True, "Risk percentage ({risk_percentage:.2f}%) exceeds maximum allowed ({max_risk:.2f}%)"),
+    (4, False, "Risk:reward ratio ({risk_reward_ratio:.2f}) is below recommended minimum (1.0)"),
+    (8, True, "Stop loss must be below current price"),
+)
+
+def _validate_inputs(**values: float):
+    """Raise ValueError unless every value is a positive, finite number"""
+    for name, value in values.items():
+        if not (math.isfinite(value) and value > 0):
+            raise ValueError(f"{name} must be positive and finite, got {value!r}")
+
+def _risk_kernel(price, atr, portfolio_value, atr_multiplier, risk_per_trade,
+                 max_position_size, risk_reward_ratio):
+    """
+    Scalar arithmetic behind RiskManager.calculate_risk_controls
+    
+    Returns:
+        (position_size, stop_loss, take_profit, risk_amount, risk_percentage,
+        potential_profit, potential_profit_percentage, risk_reward_ratio)
+    """
+    # Stop loss distance from ATR, position size from the risk budget
+    stop_loss_distance = atr * atr_multiplier
+    position_size = min(
+        portfolio_value * risk_per_trade / stop_loss_distance,
+        portfolio_value * max_position_size / price
+    )
+    take_profit_distance = stop_loss_distance * risk_reward_ratio
+    
+    risk_amount = position_size * stop_loss_distance
+    potential_profit = position_size * take_profit_distance
+    return (
+        position_size,
+        price - stop_loss_distance,
+        price + take_profit_distance,
+        risk_amount,
+        risk_amount / portfolio_value * 100,
+        potential_profit,
+        potential_profit / portfolio_value * 100,
+        take_profit_distance / stop_loss_distance
+    )
+
+def _position_size_kernel(price, stop_loss_distance, portfolio_value, risk_percentage, max_position_size):
+    """Position size for a risk budget, capped by the maximum position value"""
+    return min(
+        portfolio_value * risk_percentage / stop_loss_distance,
+        portfolio_value * max_position_size / price
+    )
+
+if numba is not None:
+    # Explicit signatures compile at import (or load from the on-disk cache)
+    # instead of on the first trade. Division by zero still raises
+    # ZeroDivisionError under njit, so the callers' fallbacks behave the same
+    # with or without numba
+    _risk_kernel = numba.njit(
+        "UniTuple(float64, 8)(float64, float64, float64, float64, float64, float64, float64)",
+        cache=True, fastmath=True
+    )(_risk_kernel)
+    _position_size_kernel = numba.njit(
+        "float64(float64, float64, float64, float64, float64)",
+        cache=True, fastmath=True
+    )(_position_size_kernel)
+    
+    @numba.njit(cache=True, fastmath=True, parallel=True, error_model="numpy")
+    def _levels_batch(prices, atrs, portfolio_value, atr_multiplier, risk_reward_ratio,
+                      risk_per_trade, max_position_size):
+        """Fused stop loss / take profit / position size, one symbol per prange iteration"""
+        n = prices.shape[0]
+        stop_loss = np.empty(n)
+        take_profit = np.empty(n)
+        position_size = np.empty(n)
+        for i in numba.prange(n):
+            stop_loss_distance = atrs[i] * atr_multiplier
+            stop_loss[i] = prices[i] - stop_loss_distance
+            take_profit[i] = prices[i] + stop_loss_distance * risk_reward_ratio
+            position_size[i] = min(
+                portfolio_value * risk_per_trade / stop_loss_distance,
+                portfolio_value * max_position_size / prices[i]
+            )
+        return stop_loss, take_profit, position_size
+else:
+    _levels_batch = None
+
+class RiskResult(NamedTuple):
+    """Risk controls for one position (see RiskManager.calculate_risk_controls)"""
+    position_size: float
+    position_value: float
+    stop_loss: float
+    take_profit: float
+    risk_amount: float
+    risk_percentage: float
+    potential_profit: float
+    potential_profit_percentage: float
+    risk_reward_ratio: float
+    atr_multiplier: float
+    
+    def as_dict(self, timestamp: Optional[datetime] = None) -> Dict:
+        """Fields as a dict plus a timestamp (default: now), for the API layer"""
+        result = self._asdict()
+        result["timestamp"] = timestamp or datetime.now()
+        return result
+
+@dataclass
+class PositionBook:
+    """Positions as parallel float64 columns, one entry per position"""
+    prices: np.ndarray
+    atrs: np.ndarray
+    risk_amounts: np.ndarray
+    position_values: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.prices)
+
 class RiskManager:
     """Risk management for crypto trading positions"""
     
@@ -21,7 +147,7 @@ class RiskManager:
         self.risk_reward_ratio = 2.0   # Minimum risk:reward ratio
         self.max_portfolio_risk = 0.05 # 5% maximum portfolio risk
         
-    def calculate_risk_controls(self, current_price: float, atr: float, portfolio_value: float = 10000.0) -> Dict:
+    def calculate_risk_controls(self, current_price: float, atr: float, portfolio_value: float = 10000.0) -> RiskResult:
         """
         Calculate risk management controls for a position
         
@@ -31,62 +157,113 @@ class RiskManager:
             portfolio_value: Total portfolio value
             
         Returns:
-            Dict with position size, stop loss, take profit, and risk metrics
+            RiskResult with position size, stop loss, take profit, and risk
+            metrics; as_dict() adds the timestamp for serialization
         """
         try:
-            # Calculate position size based on risk per trade
-            risk_amount = portfolio_value * self.risk_per_trade
-            
-            # Calculate stop loss distance using ATR
-            stop_loss_distance = atr * self.atr_multiplier
-            
-            # Calculate stop loss price
-            stop_loss_price = current_price - stop_loss_distance
+            _validate_inputs(current_price=current_price, atr=atr, portfolio_value=portfolio_value)
+            
+            (position_size, stop_loss_price, take_profit_price, actual_risk_amount,
+             actual_risk_percentage, potential_profit, potential_profit_percentage,
+             actual_risk_reward_ratio) = _risk_kernel(
+                current_price, atr, portfolio_value, self.atr_multiplier,
+                self.risk_per_trade, self.max_position_size, self.risk_reward_ratio
+            )
+            
+            result = RiskResult(
+                round(position_size, 6),
+                round(position_size * current_price, 2),
+                round(stop_loss_price, 2),
+                round(take_profit_price, 2),
+                round(actual_risk_amount, 2),
+                round(actual_risk_percentage, 2),
+                round(potential_profit, 2),
+                round(potential_profit_percentage, 2),
+                round(actual_risk_reward_ratio, 2),
+                self.atr_multiplier
+            )
             
-            # Calculate position size based on risk amount and stop loss distance
-            position_size = risk_amount / stop_loss_distance
-            
-            # Apply maximum position size limit
-            max_position_value = portfolio_value * self.max_position_size
-            max_position_size_by_value = max_position_value / current_price
+            logger.info(f"Risk controls calculated: Position size {position_size:.6f}, Risk {actual_risk_percentage:.2f}%")
+            return result
             
-            position_size = min(position_size, max_position_size_by_value)
+        except Exception as e:
+            logger.error(f"Error calculating risk controls: {e}")
+            return self._get_default_risk_controls(current_price)
+    
+    def calculate_risk_controls_batch(self, book: PositionBook, portfolio_value: float = 10000.0) -> Dict[str, np.ndarray]:
+        """
+        Vectorized calculate_risk_controls over every position in a book
+        
+        Args:
+            book: Positions; only prices and atrs are read
+            portfolio_value: Total portfolio value
             
-            # Calculate take profit based on risk:reward ratio
+        Returns:
+            Dict of unrounded float64 arrays named like RiskResult fields
+            (rows with a zero ATR come out as inf/NaN instead of defaults)
+        """
+        prices = np.asarray(book.prices, dtype=np.float64)
+        stop_loss_distance = np.asarray(book.atrs, dtype=np.float64) * self.atr_multiplier
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            position_size = np.minimum(
+                portfolio_value * self.risk_per_trade / stop_loss_distance,
+                portfolio_value * self.max_position_size / prices
+            )
             take_profit_distance = stop_loss_distance * self.risk_reward_ratio
-            take_profit_price = current_price + take_profit_distance
-            
-            # Calculate actual risk metrics
-            actual_risk_amount = position_size * stop_loss_distance
-            actual_risk_percentage = (actual_risk_amount / portfolio_value) * 100
-            
-            # Calculate potential profit
+            risk_amount = position_size * stop_loss_distance
             potential_profit = position_size * take_profit_distance
-            potential_profit_percentage = (potential_profit / portfolio_value) * 100
-            
-            # Calculate actual risk:reward ratio
-            actual_risk_reward_ratio = take_profit_distance / stop_loss_distance
             
-            result = {
-                "position_size": round(position_size, 6),
-                "position_value": round(position_size * current_price, 2),
-                "stop_loss": round(stop_loss_price, 2),
-                "take_profit": round(take_profit_price, 2),
-                "risk_amount": round(actual_risk_amount, 2),
-                "risk_percentage": round(actual_risk_percentage, 2),
-                "potential_profit": round(potential_profit, 2),
-                "potential_profit_percentage": round(potential_profit_percentage, 2),
-                "risk_reward_ratio": round(actual_risk_reward_ratio, 2),
-                "atr_multiplier": self.atr_multiplier,
-                "timestamp": datetime.now()
+            return {
+                "position_size": position_size,
+                "position_value": position_size * prices,
+                "stop_loss": prices - stop_loss_distance,
+                "take_profit": prices + take_profit_distance,
+                "risk_amount": risk_amount,
+                "risk_percentage": risk_amount / portfolio_value * 100,
+                "potential_profit": potential_profit,
+                "potential_profit_percentage": potential_profit / portfolio_value * 100,
+                "risk_reward_ratio": take_profit_distance / stop_loss_distance
             }
+    
+    def calculate_levels_batch(self, prices: np.ndarray, atrs: np.ndarray,
+                               portfolio_value: float = 10000.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Stop loss, take profit and position size for many symbols in one sweep
+        
+        Same formulas as calculate_stop_loss, calculate_take_profit and
+        calculate_risk_controls' position sizing, unrounded. Uses a parallel
+        numba kernel when numba is installed.
+        
+        Args:
+            prices: Current price per symbol
+            atrs: ATR per symbol
+            portfolio_value: Total portfolio value
             
-            logger.info(f"Risk controls calculated: Position size {position_size:.6f}, Risk {actual_risk_percentage:.2f}%")
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error calculating risk controls: {e}")
-            return self._get_default_risk_controls(current_price)
+        Returns:
+            (stop_losses, take_profits, position_sizes) arrays; symbols with a
+            zero ATR get inf/NaN instead of an exception
+        """
+        prices = np.ascontiguousarray(prices, dtype=np.float64)
+        atrs = np.ascontiguousarray(atrs, dtype=np.float64)
+        
+        if _levels_batch is not None:
+            return _levels_batch(
+                prices, atrs, portfolio_value, self.atr_multiplier, self.risk_reward_ratio,
+                self.risk_per_trade, self.max_position_size
+            )
+        
+        stop_loss_distance = atrs * self.atr_multiplier
+        with np.errstate(divide='ignore', invalid='ignore'):
+            position_size = np.minimum(
+                portfolio_value * self.risk_per_trade / stop_loss_distance,
+                portfolio_value * self.max_position_size / prices
+            )
+        return (
+            prices - stop_loss_distance,
+            prices + stop_loss_distance * self.risk_reward_ratio,
+            position_size
+        )
     
     def calculate_position_size(self, current_price: float, stop_loss_price: float, portfolio_value: float, risk_percentage: float = None) -> float:
         """
@@ -100,33 +277,27 @@ class RiskManager:
             
         Returns:
             Position size in units
-        """
-        try:
-            if risk_percentage is None:
-                risk_percentage = self.risk_per_trade
-            
-            # Calculate risk amount
-            risk_amount = portfolio_value * risk_percentage
             
-            # Calculate stop loss distance
-            stop_loss_distance = current_price - stop_loss_price
-            
-            if stop_loss_distance <= 0:
-                logger.warning("Invalid stop loss price")
-                return 0.0
-            
-            # Calculate position size
-            position_size = risk_amount / stop_loss_distance
-            
-            # Apply maximum position size limit
-            max_position_value = portfolio_value * self.max_position_size
-            max_position_size_by_value = max_position_value / current_price
-            
-            return min(position_size, max_position_size_by_value)
-            
-        except Exception as e:
-            logger.error(f"Error calculating position size: {e}")
+        Raises:
+            ValueError: If current_price or portfolio_value is not positive and finite
+        """
+        _validate_inputs(current_price=current_price, portfolio_value=portfolio_value)
+        
+        if risk_percentage is None:
+            risk_percentage = self.risk_per_trade
+        
+        # Calculate stop loss distance
+        stop_loss_distance = current_price - stop_loss_price
+        
+        if stop_loss_distance <= 0:
+            logger.warning("Invalid stop loss price")
             return 0.0
+        
+        # Position size from the risk amount, capped by the maximum position value
+        return _position_size_kernel(
+            current_price, stop_loss_distance, portfolio_value,
+            risk_percentage, self.max_position_size
+        )
     
     def calculate_stop_loss(self, current_price: float, atr: float, multiplier: float = None) -> float:
         """
@@ -139,19 +310,19 @@ class RiskManager:
             
         Returns:
             Stop loss price
-        """
-        try:
-            if multiplier is None:
-                multiplier = self.atr_multiplier
-            
-            stop_loss_distance = atr * multiplier
-            stop_loss_price = current_price - stop_loss_distance
-            
-            return round(stop_loss_price, 2)
             
-        except Exception as e:
-            logger.error(f"Error calculating stop loss: {e}")
-            return current_price * 0.95  # 5% stop loss fallback
+        Raises:
+            ValueError: If current_price or atr is not positive and finite
+        """
+        _validate_inputs(current_price=current_price, atr=atr)
+        
+        if multiplier is None:
+            multiplier = self.atr_multiplier
+        
+        stop_loss_distance = atr * multiplier
+        stop_loss_price = current_price - stop_loss_distance
+        
+        return round(stop_loss_price, 2)
     
     def calculate_take_profit(self, current_price: float, stop_loss_price: float, risk_reward_ratio: float = None) -> float:
         """
@@ -164,39 +335,49 @@ class RiskManager:
             
         Returns:
             Take profit price
-        """
-        try:
-            if risk_reward_ratio is None:
-                risk_reward_ratio = self.risk_reward_ratio
-            
-            stop_loss_distance = current_price - stop_loss_price
-            take_profit_distance = stop_loss_distance * risk_reward_ratio
-            take_profit_price = current_price + take_profit_distance
-            
-            return round(take_profit_price, 2)
             
-        except Exception as e:
-            logger.error(f"Error calculating take profit: {e}")
-            return current_price * 1.10  # 10% take profit fallback
+        Raises:
+            ValueError: If current_price or stop_loss_price is not positive and finite
+        """
+        _validate_inputs(current_price=current_price, stop_loss_price=stop_loss_price)
+        
+        if risk_reward_ratio is None:
+            risk_reward_ratio = self.risk_reward_ratio
+        
+        stop_loss_distance = current_price - stop_loss_price
+        take_profit_distance = stop_loss_distance * risk_reward_ratio
+        take_profit_price = current_price + take_profit_distance
+        
+        return round(take_profit_price, 2)
     
-    def calculate_portfolio_risk(self, positions: list) -> Dict:
+    def calculate_portfolio_risk(self, positions: Union[list, PositionBook]) -> Dict:
         """
         Calculate total portfolio risk
         
         Args:
-            positions: List of position dictionaries
+            positions: List of position dictionaries, or a PositionBook
             
         Returns:
             Dict with portfolio risk metrics
         """
         try:
-            total_risk = 0.0
-            total_value = 0.0
             position_count = len(positions)
             
-            for position in positions:
-                total_risk += position.get('risk_amount', 0)
-                total_value += position.get('position_value', 0)
+            if isinstance(positions, PositionBook):
+                risks, values = positions.risk_amounts, positions.position_values
+            else:
+                try:
+                    fields = [_RISK_FIELDS(position) for position in positions]
+                except KeyError:
+                    # Positions missing a field count it as 0
+                    fields = [
+                        (position.get('risk_amount', 0), position.get('position_value', 0))
+                        for position in positions
+                    ]
+                columns = np.array(fields, dtype=np.float64).reshape(-1, 2)
+                risks, values = columns[:, 0], columns[:, 1]
+            total_risk = float(risks.sum())
+            total_value = float(values.sum())
             
             portfolio_risk_percentage = (total_risk / total_value) * 100 if total_value > 0 else 0
             
@@ -241,32 +422,35 @@ class RiskManager:
             Dict with validation results
         """
         try:
-            warnings = []
-            errors = []
-            
-            # Check position size
             position_size = risk_controls.get('position_size', 0)
-            if position_size <= 0:
-                errors.append("Position size must be positive")
-            
-            # Check risk percentage
             risk_percentage = risk_controls.get('risk_percentage', 0)
-            if risk_percentage > self.max_portfolio_risk * 100:
-                errors.append(f"Risk percentage ({risk_percentage:.2f}%) exceeds maximum allowed ({self.max_portfolio_risk * 100:.2f}%)")
-            
-            # Check risk:reward ratio
             risk_reward_ratio = risk_controls.get('risk_reward_ratio', 0)
-            if risk_reward_ratio < 1.0:
-                warnings.append(f"Risk:reward ratio ({risk_reward_ratio:.2f}) is below recommended minimum (1.0)")
-            
-            # Check stop loss
             stop_loss = risk_controls.get('stop_loss', 0)
             current_price = risk_controls.get('current_price', 0)
-            if stop_loss >= current_price:
-                errors.append("Stop loss must be below current price")
+            max_risk = self.max_portfolio_risk * 100
+            
+            # All checks at once, one bit each (see _RISK_CHECKS)
+            mask = (
+                (position_size <= 0)
+                | (risk_percentage > max_risk) << 1
+                | (risk_reward_ratio < 1.0) << 2
+                | (stop_loss >= current_price) << 3
+            )
+            
+            warnings = []
+            errors = []
+            if mask:
+                # Only failed checks format their message
+                for bit, is_error, message in _RISK_CHECKS:
+                    if mask & bit:
+                        (errors if is_error else warnings).append(message.format(
+                            risk_percentage=risk_percentage,
+                            max_risk=max_risk,
+                            risk_reward_ratio=risk_reward_ratio
+                        ))
             
             validation_result = {
-                "is_valid": len(errors) == 0,
+                "is_valid": not errors,
                 "warnings": warnings,
                 "errors": errors,
                 "timestamp": datetime.now()
@@ -283,21 +467,20 @@ class RiskManager:
                 "timestamp": datetime.now()
             }
     
-    def _get_default_risk_controls(self, current_price: float) -> Dict:
+    def _get_default_risk_controls(self, current_price: float) -> RiskResult:
         """Get default risk controls when calculation fails"""
-        return {
-            "position_size": 0.001,
-            "position_value": current_price * 0.001,
-            "stop_loss": current_price * 0.95,
-            "take_profit": current_price * 1.10,
-            "risk_amount": current_price * 0.001 * 0.05,
-            "risk_percentage": 0.5,
-            "potential_profit": current_price * 0.001 * 0.10,
-            "potential_profit_percentage": 1.0,
-            "risk_reward_ratio": 2.0,
-            "atr_multiplier": self.atr_multiplier,
-            "timestamp": datetime.now()
-        }
+        return RiskResult(
+            position_size=0.001,
+            position_value=current_price * 0.001,
+            stop_loss=current_price * 0.95,
+            take_profit=current_price * 1.10,
+            risk_amount=current_price * 0.001 * 0.05,
+            risk_percentage=0.5,
+            potential_profit=current_price * 0.001 * 0.10,
+            potential_profit_percentage=1.0,
+            risk_reward_ratio=2.0,
+            atr_multiplier=self.atr_multiplier
+        )
     
     def update_risk_parameters(self, **kwargs):
         """Update risk management parameters"""
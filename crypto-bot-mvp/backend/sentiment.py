@@ -4,28 +4,89 @@ Analyzes crypto news headlines and social media sentiment
 """
 
 import asyncio
+import bisect
 import logging
+import os
+import re
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 import numpy as np
 
 # Placeholder for transformers - will be imported when available
 try:
+    import torch
     from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
     TRANSFORMERS_AVAILABLE = True
 except ImportError:
     TRANSFORMERS_AVAILABLE = False
     print("Warning: transformers library not available. Using mock sentiment analysis.")
 
+# Optional int8 ONNX Runtime backend for CPU inference
+try:
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+_rng = np.random.default_rng()
+
+# Keywords for the mock (non-FinBERT) sentiment analysis
+POSITIVE_KEYWORDS = [
+    "high", "growth", "adoption", "promising", "record", "recovery",
+    "sustainable", "mainstream", "upgrade", "breakthrough"
+]
+NEGATIVE_KEYWORDS = [
+    "crash", "panic", "concerns", "volatility", "crackdown", "dip",
+    "decline", "fall", "loss", "bearish"
+]
+
+# Sentiment label for a 0-100 score: SENTIMENT_LABELS[bisect_right(SENTIMENT_LABEL_BOUNDS, score)]
+SENTIMENT_LABEL_BOUNDS = (30, 40, 60, 70)
+SENTIMENT_LABELS = ("Very Bearish", "Bearish", "Neutral", "Bullish", "Very Bullish")
+
+# Below this many values, plain Python beats NumPy's array and ufunc overhead
+SMALL_BATCH = 32
+
+def _mean_std(values: Sequence[float]) -> Tuple[float, float]:
+    """Mean and population standard deviation, (0.0, 0.0) when empty"""
+    n = len(values)
+    if n == 0:
+        return 0.0, 0.0
+    if n >= SMALL_BATCH:
+        array = np.asarray(values, dtype=np.float64)
+        return float(array.mean()), float(array.std())
+    
+    mean = sum(values) / n
+    return mean, (sum((x - mean) ** 2 for x in values) / n) ** 0.5
+
+def _keyword_pattern(keywords: List[str]) -> re.Pattern:
+    """One regex matching any keyword at the start of a word ("crash" also hits "crashes")"""
+    return re.compile(r"\b(?:" + "|".join(map(re.escape, keywords)) + r")")
+
 class SentimentAnalyzer:
     """Sentiment analysis for crypto market using FinBERT"""
     
     def __init__(self):
         self.model = None
         self.tokenizer = None
+        self.sentiment_pipeline = None
         self.initialized = False
+        self.model_dir = "models"  # quantized FinBERT export is cached here
+        
+        # headline -> (positive, -negative) FinBERT scores, least recently used first
+        self._headline_scores: OrderedDict = OrderedDict()
+        self.headline_cache_size = 4096
+        
+        # One inference (or cache read) at a time; inference itself runs off the event loop
+        self._infer_lock = asyncio.Lock()
+        
+        # Keyword matchers for the mock analysis, compiled once
+        self._pos_re = _keyword_pattern(POSITIVE_KEYWORDS)
+        self._neg_re = _keyword_pattern(NEGATIVE_KEYWORDS)
         
         # Mock crypto headlines for testing
         self.mock_headlines = [
@@ -49,21 +110,40 @@ class SentimentAnalyzer:
             return
         
         try:
+            # Scores from a previous model no longer apply
+            self._headline_scores.clear()
+            
             # Load FinBERT model for financial sentiment analysis
             model_name = "ProsusAI/finbert"
             
             # Initialize tokenizer and model
             self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
+            
+            if torch.cuda.is_available() or not ONNX_AVAILABLE:
+                # FP32 PyTorch model, on the GPU when there is one
+                self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
+                device = 0 if torch.cuda.is_available() else -1
+            else:
+                # Dynamic int8 quantized ONNX model for CPU inference
+                self.model = self._load_quantized_model(model_name)
+                device = None
             
             # Create sentiment analysis pipeline
             self.sentiment_pipeline = pipeline(
                 "sentiment-analysis",
                 model=self.model,
                 tokenizer=self.tokenizer,
-                return_all_scores=True
+                return_all_scores=True,
+                device=device
             )
             
+            if isinstance(self.model, torch.nn.Module):
+                self._compile_model()
+            
+            # Tokenize and score the whole headline pool in one batch up front,
+            # so polls are served from the score cache
+            self._finbert_scores(self.mock_headlines)
+            
             self.initialized = True
             logger.info("FinBERT sentiment analyzer initialized successfully")
             
@@ -71,6 +151,46 @@ class SentimentAnalyzer:
             logger.error(f"Failed to initialize FinBERT: {e}")
             self.initialized = False
     
+    def _compile_model(self):
+        """
+        Swap the pipeline's PyTorch model for a torch.compile'd graph
+        
+        Compilation happens on the first forward pass, so the headline pool
+        is scored here as the warm-up. Falls back to eager mode if
+        compilation fails.
+        """
+        try:
+            self.model.eval()
+            mode = "reduce-overhead" if torch.cuda.is_available() else "default"
+            # dynamic=True: headline batches vary in padded length
+            self.sentiment_pipeline.model = torch.compile(self.model, mode=mode, dynamic=True)
+            self._finbert_scores(self.mock_headlines)
+        except Exception as e:
+            logger.warning(f"torch.compile failed, running FinBERT eagerly: {e}")
+            self.sentiment_pipeline.model = self.model
+            self._headline_scores.clear()
+    
+    def _load_quantized_model(self, model_name: str):
+        """
+        Load FinBERT as a dynamically int8-quantized ONNX model
+        
+        The export and quantization run once; later starts load the cached
+        model from model_dir.
+        """
+        save_dir = os.path.join(self.model_dir, "finbert-int8")
+        file_name = "model_quantized.onnx"
+        
+        if not os.path.exists(os.path.join(save_dir, file_name)):
+            logger.info("Exporting and quantizing FinBERT to int8 ONNX...")
+            onnx_model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+            quantizer = ORTQuantizer.from_pretrained(onnx_model)
+            quantizer.quantize(
+                save_dir=save_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            )
+        
+        return ORTModelForSequenceClassification.from_pretrained(save_dir, file_name=file_name)
+    
     async def analyze_crypto_sentiment(self) -> Dict:
         """
         Analyze sentiment for crypto market
@@ -87,27 +207,17 @@ class SentimentAnalyzer:
             
             if TRANSFORMERS_AVAILABLE and self.sentiment_pipeline:
                 # Use FinBERT for real sentiment analysis
-                sentiment_scores = []
-                
-                for headline in headlines:
-                    try:
-                        result = self.sentiment_pipeline(headline)
-                        # Extract positive/negative scores
-                        for score_dict in result[0]:
-                            if score_dict['label'] == 'positive':
-                                sentiment_scores.append(score_dict['score'])
-                            elif score_dict['label'] == 'negative':
-                                sentiment_scores.append(-score_dict['score'])
-                    except Exception as e:
-                        logger.error(f"Error analyzing headline '{headline}': {e}")
-                        continue
+                try:
+                    async with self._infer_lock:
+                        if all(headline in self._headline_scores for headline in headlines):
+                            sentiment_scores = self._finbert_scores(headlines)
+                        else:
+                            sentiment_scores = await asyncio.to_thread(self._finbert_scores, headlines)
+                except Exception as e:
+                    logger.error(f"Error analyzing headlines: {e}")
+                    sentiment_scores = []
                 
-                if sentiment_scores:
-                    avg_sentiment = np.mean(sentiment_scores)
-                    confidence = np.std(sentiment_scores)
-                else:
-                    avg_sentiment = 0.0
-                    confidence = 0.0
+                avg_sentiment, confidence = _mean_std(sentiment_scores)
             else:
                 # Use mock sentiment analysis
                 avg_sentiment, confidence = self._mock_sentiment_analysis(headlines)
@@ -116,17 +226,8 @@ class SentimentAnalyzer:
             sentiment_score = (avg_sentiment + 1) * 50  # Convert from [-1,1] to [0,100]
             sentiment_score = max(0, min(100, sentiment_score))  # Clamp to [0,100]
             
-            # Determine sentiment label
-            if sentiment_score >= 70:
-                sentiment_label = "Very Bullish"
-            elif sentiment_score >= 60:
-                sentiment_label = "Bullish"
-            elif sentiment_score >= 40:
-                sentiment_label = "Neutral"
-            elif sentiment_score >= 30:
-                sentiment_label = "Bearish"
-            else:
-                sentiment_label = "Very Bearish"
+            # Determine sentiment label (a bound itself belongs to the bucket above it)
+            sentiment_label = SENTIMENT_LABELS[bisect.bisect_right(SENTIMENT_LABEL_BOUNDS, sentiment_score)]
             
             result = {
                 "score": round(sentiment_score, 2),
@@ -147,48 +248,64 @@ class SentimentAnalyzer:
                 "timestamp": datetime.now()
             }
     
+    def _finbert_scores(self, headlines: List[str]) -> List[float]:
+        """
+        Positive score and negated negative score of each headline, flattened
+        
+        Scores are cached per headline text; headlines not seen before go
+        through the pipeline together in one batch.
+        """
+        cache = self._headline_scores
+        fresh = [headline for headline in dict.fromkeys(headlines) if headline not in cache]
+        
+        if fresh:
+            results = self.sentiment_pipeline(fresh, batch_size=len(fresh), truncation=True)
+            for headline, scores in zip(fresh, results):
+                positive = negative = 0.0
+                for score_dict in scores:
+                    if score_dict['label'] == 'positive':
+                        positive = score_dict['score']
+                    elif score_dict['label'] == 'negative':
+                        negative = score_dict['score']
+                cache[headline] = (positive, -negative)
+        
+        sentiment_scores = []
+        for headline in headlines:
+            sentiment_scores.extend(cache[headline])
+            cache.move_to_end(headline)
+        
+        while len(cache) > self.headline_cache_size:
+            cache.popitem(last=False)
+        
+        return sentiment_scores
+    
     def _get_recent_headlines(self) -> List[str]:
         """Get recent crypto headlines (mock implementation)"""
         # In a real implementation, this would fetch from news APIs
         # For MVP, we'll use mock data
-        import random
-        return random.sample(self.mock_headlines, min(5, len(self.mock_headlines)))
+        picks = _rng.choice(len(self.mock_headlines), size=min(5, len(self.mock_headlines)), replace=False)
+        return [self.mock_headlines[i] for i in picks]
     
     def _mock_sentiment_analysis(self, headlines: List[str]) -> tuple:
         """Mock sentiment analysis for testing purposes"""
-        # Simple keyword-based sentiment analysis
-        positive_keywords = [
-            "high", "growth", "adoption", "promising", "record", "recovery",
-            "sustainable", "mainstream", "upgrade", "breakthrough"
-        ]
-        negative_keywords = [
-            "crash", "panic", "concerns", "volatility", "crackdown", "dip",
-            "decline", "fall", "loss", "bearish"
-        ]
-        
-        sentiment_scores = []
-        
-        for headline in headlines:
-            headline_lower = headline.lower()
-            
-            positive_count = sum(1 for word in positive_keywords if word in headline_lower)
-            negative_count = sum(1 for word in negative_keywords if word in headline_lower)
-            
-            if positive_count > negative_count:
-                sentiment_scores.append(0.7)  # Positive
-            elif negative_count > positive_count:
-                sentiment_scores.append(-0.7)  # Negative
-            else:
-                sentiment_scores.append(0.0)  # Neutral
+        # Simple keyword-based sentiment analysis: distinct keywords per headline
+        lowered = [headline.lower() for headline in headlines]
+        positive_counts = [len(set(self._pos_re.findall(h))) for h in lowered]
+        negative_counts = [len(set(self._neg_re.findall(h))) for h in lowered]
         
-        if sentiment_scores:
-            avg_sentiment = np.mean(sentiment_scores)
-            confidence = np.std(sentiment_scores)
+        # 0.7 positive, -0.7 negative, 0.0 neutral
+        if len(lowered) < SMALL_BATCH:
+            sentiment_scores = [
+                0.7 if pos > neg else -0.7 if neg > pos else 0.0
+                for pos, neg in zip(positive_counts, negative_counts)
+            ]
         else:
-            avg_sentiment = 0.0
-            confidence = 0.0
+            positive_counts = np.array(positive_counts)
+            negative_counts = np.array(negative_counts)
+            sentiment_scores = np.where(positive_counts > negative_counts, 0.7, 0.0)
+            sentiment_scores[negative_counts > positive_counts] = -0.7
         
-        return avg_sentiment, confidence
+        return _mean_std(sentiment_scores)
     
     async def analyze_social_sentiment(self, platform: str = "twitter") -> Dict:
         """
@@ -205,8 +322,8 @@ class SentimentAnalyzer:
         
         mock_social_sentiment = {
             "platform": platform,
-            "mentions": np.random.randint(100, 1000),
-            "sentiment_score": np.random.uniform(0, 100),
+            "mentions": int(_rng.integers(100, 1000)),
+            "sentiment_score": float(_rng.uniform(0, 100)),
             "sentiment_label": "Neutral",
             "trending_topics": ["bitcoin", "ethereum", "defi"],
             "timestamp": datetime.now()
@@ -241,8 +358,8 @@ class SentimentAnalyzer:
         
         mock_news_sentiment = {
             "source": news_source,
-            "articles_analyzed": np.random.randint(10, 50),
-            "sentiment_score": np.random.uniform(0, 100),
+            "articles_analyzed": int(_rng.integers(10, 50)),
+            "sentiment_score": float(_rng.uniform(0, 100)),
             "sentiment_label": "Neutral",
             "key_themes": ["regulation", "adoption", "technology"],
             "timestamp": datetime.now()
@@ -6,20 +6,58 @@ Quick test version with mock data
 import asyncio
 import json
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional
+import time
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Sequence, Set, Type
 import random
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 
+try:
+    import orjson
+    
+    def _dumps(data) -> str:
+        return orjson.dumps(data, default=str).decode()
+    
+    _response_class = ORJSONResponse
+except ImportError:
+    def _dumps(data) -> str:
+        return json.dumps(data, default=str)
+    
+    _response_class = JSONResponse
+
+try:
+    import zstandard
+    _zstd = zstandard.ZstdCompressor(level=3)
+except ImportError:
+    _zstd = None
+
+try:
+    import numpy as np
+    _rng = np.random.default_rng()
+    
+    def _draw(n: int) -> List[float]:
+        """n uniform floats in [0, 1) from one generator call"""
+        return _rng.random(n).tolist()
+except ImportError:
+    def _draw(n: int) -> List[float]:
+        """n uniform floats in [0, 1)"""
+        return [random.random() for _ in range(n)]
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize FastAPI app
-app = FastAPI(title="Crypto Trading Bot Dashboard", version="1.0.0")
+# REST responses are rendered with orjson when it is installed
+app = FastAPI(
+    title="Crypto Trading Bot Dashboard",
+    version="1.0.0",
+    default_response_class=_response_class
+)
 
 # Add CORS middleware
 app.add_middleware(
@@ -30,106 +68,156 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# The endpoints below only call in-memory mock generators, so rather than
+# wrapping each one, errors are caught here once
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    logger.error(f"Error in {request.url.path}: {exc}")
+    return _response_class(status_code=500, content={"detail": str(exc)})
+
 # Pydantic models
 class PriceResponse(BaseModel):
     symbol: str
     price: float
-    timestamp: datetime
+    timestamp: int  # epoch milliseconds
 
 class IndicatorsResponse(BaseModel):
     rsi: float
     adx: float
     atr: float
     momentum_signal: str
-    timestamp: datetime
+    timestamp: int  # epoch milliseconds
 
 class SentimentResponse(BaseModel):
     score: float
     sentiment: str
     confidence: float
-    timestamp: datetime
+    timestamp: int  # epoch milliseconds
 
 class SignalResponse(BaseModel):
     signal: str
     confidence: float
     reasoning: str
-    timestamp: datetime
+    timestamp: int  # epoch milliseconds
 
 class RiskResponse(BaseModel):
     position_size: float
     stop_loss: float
     take_profit: float
     risk_reward_ratio: float
-    timestamp: datetime
+    timestamp: int  # epoch milliseconds
+
+def model_response(model: Type[BaseModel], data: Dict) -> Response:
+    """
+    JSON response with the fields of model taken from trusted data
+    
+    The mock generators always produce valid data, so this skips Pydantic
+    validation and serialization and encodes straight from the dict. FastAPI
+    passes a returned Response through untouched; response_model still
+    documents the schema.
+    """
+    return Response(
+        content=_dumps({name: data[name] for name in model.model_fields}),
+        media_type="application/json"
+    )
+
+# Mock data generators. Each takes its uniforms in [0, 1) as u (drawn for it
+# when omitted), so one tick can draw all MOCK_DRAWS values in a single call,
+# and its timestamp as now_ms in epoch milliseconds (read when omitted), so
+# one tick reads the clock once
+MOCK_DRAWS = 14  # 1 price + 3 indicators + 2 sentiment + 5 signal + 3 risk
+
+# Label lookup tables. Bucket indices come from bisecting against the
+# thresholds, with left/right chosen so the strict and inclusive comparisons
+# of the original if/else chains are kept exactly
+MOMENTUM_TABLE = (
+    # adx <= 25   25 < adx <= 40   adx > 40
+    ("Neutral", "Bullish", "Strong Bullish"),  # rsi < 30
+    ("Neutral", "Bullish", "Bullish"),         # 30 <= rsi < 40
+    ("Neutral", "Neutral", "Neutral"),         # 40 <= rsi <= 60
+    ("Neutral", "Bearish", "Bearish"),         # 60 < rsi <= 70
+    ("Neutral", "Bearish", "Strong Bearish"),  # rsi > 70
+)
+SENTIMENT_TABLE = ("Very Bearish", "Bearish", "Neutral", "Bullish", "Very Bullish")
+
+def momentum_label(rsi: float, adx: float) -> str:
+    """Momentum label for an RSI/ADX pair from MOMENTUM_TABLE"""
+    rsi_bucket = bisect_right((30, 40), rsi) + bisect_left((60, 70), rsi)
+    return MOMENTUM_TABLE[rsi_bucket][bisect_left((25, 40), adx)]
 
-# Mock data generators
-def get_mock_price(symbol: str = "BTC-USD") -> Dict:
-    """Generate realistic mock price data"""
-    base_price = 45000 if "BTC" in symbol else 3000 if "ETH" in symbol else 100
-    price = base_price + random.uniform(-base_price * 0.05, base_price * 0.05)
+def sentiment_label(score: float) -> str:
+    """Sentiment label for a 0-100 score from SENTIMENT_TABLE"""
+    return SENTIMENT_TABLE[bisect_left((30, 40), score) + bisect_right((60, 70), score)]
+
+# Mock base prices for the usual pairs; other symbols fall back to matching
+# BTC/ETH anywhere in the name
+BASE_PRICES = {"BTC-USD": 45000, "ETH-USD": 3000}
+
+def get_mock_price(symbol: str = "BTC-USD", u: Optional[Sequence[float]] = None,
+                   now_ms: Optional[int] = None) -> Dict:
+    """Generate realistic mock price data (1 draw)"""
+    u = u or _draw(1)
+    base_price = BASE_PRICES.get(symbol)
+    if base_price is None:
+        base_price = 45000 if "BTC" in symbol else 3000 if "ETH" in symbol else 100
+    price = base_price * (0.95 + u[0] * 0.1)
     
     return {
         "symbol": symbol,
         "price": round(price, 2),
-        "timestamp": datetime.now(),
+        "timestamp": now_ms or time.time_ns() // 1_000_000,
         "source": "mock-data"
     }
 
-def get_mock_indicators() -> Dict:
-    """Generate realistic mock technical indicators"""
-    rsi = random.uniform(20, 80)
-    adx = random.uniform(15, 50)
-    atr = random.uniform(500, 2000)
-    
-    momentum = "Strong Bullish" if rsi < 30 and adx > 40 else \
-               "Bullish" if rsi < 40 and adx > 25 else \
-               "Strong Bearish" if rsi > 70 and adx > 40 else \
-               "Bearish" if rsi > 60 and adx > 25 else "Neutral"
+def get_mock_indicators(u: Optional[Sequence[float]] = None, now_ms: Optional[int] = None) -> Dict:
+    """Generate realistic mock technical indicators (3 draws)"""
+    u = u or _draw(3)
+    rsi = 20 + u[0] * 60
+    adx = 15 + u[1] * 35
+    atr = 500 + u[2] * 1500
     
     return {
         "rsi": round(rsi, 2),
         "adx": round(adx, 2),
         "atr": round(atr, 4),
-        "momentum_signal": momentum,
-        "timestamp": datetime.now()
+        "momentum_signal": momentum_label(rsi, adx),
+        "timestamp": now_ms or time.time_ns() // 1_000_000
     }
 
-def get_mock_sentiment() -> Dict:
-    """Generate realistic mock sentiment data"""
-    score = random.uniform(20, 80)
-    
-    sentiment = "Very Bullish" if score >= 70 else \
-                "Bullish" if score >= 60 else \
-                "Very Bearish" if score <= 30 else \
-                "Bearish" if score <= 40 else "Neutral"
+def get_mock_sentiment(u: Optional[Sequence[float]] = None, now_ms: Optional[int] = None) -> Dict:
+    """Generate realistic mock sentiment data (2 draws)"""
+    u = u or _draw(2)
+    score = 20 + u[0] * 60
     
     return {
         "score": round(score, 2),
-        "sentiment": sentiment,
-        "confidence": round(random.uniform(0.6, 0.9), 2),
-        "timestamp": datetime.now()
+        "sentiment": sentiment_label(score),
+        "confidence": round(0.6 + u[1] * 0.3, 2),
+        "timestamp": now_ms or time.time_ns() // 1_000_000
     }
 
-def get_mock_signal() -> Dict:
-    """Generate realistic mock trading signal"""
+def get_mock_signal(u: Optional[Sequence[float]] = None, now_ms: Optional[int] = None) -> Dict:
+    """Generate realistic mock trading signal (5 draws)"""
+    u = u or _draw(5)
     signals = ["BUY", "SELL", "HOLD"]
-    signal = random.choice(signals)
+    signal = signals[int(u[0] * 3)]
     
-    reasoning = f"Signal: {signal} | RSI: {random.uniform(20, 80):.1f} | ADX: {random.uniform(15, 50):.1f} | Sentiment: {random.uniform(20, 80):.1f}"
+    reasoning = f"Signal: {signal} | RSI: {20 + u[1] * 60:.1f} | ADX: {15 + u[2] * 35:.1f} | Sentiment: {20 + u[3] * 60:.1f}"
     
     return {
         "signal": signal,
-        "confidence": round(random.uniform(0.6, 0.9), 3),
+        "confidence": round(0.6 + u[4] * 0.3, 3),
         "reasoning": reasoning,
-        "timestamp": datetime.now()
+        "timestamp": now_ms or time.time_ns() // 1_000_000
     }
 
-def get_mock_risk() -> Dict:
-    """Generate realistic mock risk management data"""
-    price = random.uniform(40000, 50000)
-    atr = random.uniform(500, 2000)
+def get_mock_risk(u: Optional[Sequence[float]] = None, now_ms: Optional[int] = None) -> Dict:
+    """Generate realistic mock risk management data (3 draws)"""
+    u = u or _draw(3)
+    price = 40000 + u[0] * 10000
+    atr = 500 + u[1] * 1500
     
-    position_size = random.uniform(0.001, 0.01)
+    position_size = 0.001 + u[2] * 0.009
     stop_loss = price - (atr * 2)
     take_profit = price + (atr * 4)
     
@@ -138,7 +226,7 @@ def get_mock_risk() -> Dict:
         "stop_loss": round(stop_loss, 2),
         "take_profit": round(take_profit, 2),
         "risk_reward_ratio": 2.0,
-        "timestamp": datetime.now()
+        "timestamp": now_ms or time.time_ns() // 1_000_000
     }
 
 # REST API Endpoints
@@ -160,119 +248,169 @@ async def get_config_status():
             "log_level": "INFO"
         },
         "message": "Mock data mode - all APIs configured",
-        "timestamp": datetime.now()
+        "timestamp": time.time_ns() // 1_000_000
     }
 
 @app.get("/price", response_model=PriceResponse)
 async def get_price(symbol: str = "BTC-USD"):
     """Get current price for a trading pair"""
-    try:
-        price_data = get_mock_price(symbol)
-        return PriceResponse(**price_data)
-    except Exception as e:
-        logger.error(f"Error in get_price: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return model_response(PriceResponse, get_mock_price(symbol))
 
 @app.get("/indicators", response_model=IndicatorsResponse)
 async def get_indicators(symbol: str = "BTC-USD"):
     """Get technical indicators for a trading pair"""
-    try:
-        indicators_data = get_mock_indicators()
-        return IndicatorsResponse(**indicators_data)
-    except Exception as e:
-        logger.error(f"Error in get_indicators: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return model_response(IndicatorsResponse, get_mock_indicators())
 
 @app.get("/sentiment", response_model=SentimentResponse)
 async def get_sentiment():
     """Get sentiment analysis for crypto market"""
-    try:
-        sentiment_data = get_mock_sentiment()
-        return SentimentResponse(**sentiment_data)
-    except Exception as e:
-        logger.error(f"Error in get_sentiment: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return model_response(SentimentResponse, get_mock_sentiment())
 
 @app.get("/signal", response_model=SignalResponse)
 async def get_trading_signal(symbol: str = "BTC-USD"):
     """Get trading signal based on indicators and sentiment"""
-    try:
-        signal_data = get_mock_signal()
-        return SignalResponse(**signal_data)
-    except Exception as e:
-        logger.error(f"Error in get_trading_signal: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return model_response(SignalResponse, get_mock_signal())
 
 @app.get("/risk", response_model=RiskResponse)
 async def get_risk_controls(symbol: str = "BTC-USD"):
     """Get risk management controls"""
-    try:
-        risk_data = get_mock_risk()
-        return RiskResponse(**risk_data)
-    except Exception as e:
-        logger.error(f"Error in get_risk_controls: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return model_response(RiskResponse, get_mock_risk())
 
 # WebSocket connection manager
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
+        # Subset of active_connections sent zstd-compressed binary frames
+        self.zstd_connections: Set[WebSocket] = set()
 
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket, zstd: bool = False):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
+        if zstd:
+            self.zstd_connections.add(websocket)
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
+        self.zstd_connections.discard(websocket)
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
+        if websocket in self.zstd_connections:
+            await websocket.send_bytes(_zstd.compress(message.encode()))
+        else:
+            await websocket.send_text(message)
 
     async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except:
-                self.active_connections.remove(connection)
+        connections = list(self.active_connections)
+        # Compress at most once per message, however many clients want it
+        compressed = _zstd.compress(message.encode()) if self.zstd_connections else None
+        results = await asyncio.gather(
+            *(connection.send_bytes(compressed) if connection in self.zstd_connections
+              else connection.send_text(message) for connection in connections),
+            return_exceptions=True
+        )
+        # Remove disconnected connections once, after the fan-out
+        failed = [
+            connection for connection, result in zip(connections, results)
+            if isinstance(result, Exception)
+        ]
+        self.active_connections.difference_update(failed)
+        self.zstd_connections.difference_update(failed)
 
 manager = ConnectionManager()
 
+# market_update message, reused every tick. Safe to share because
+# market_update_payload fills and encodes it without awaiting in between
+_MARKET_UPDATE = {
+    "type": "market_update",
+    "data": {"price": None, "indicators": None, "sentiment": None, "signal": None, "risk": None},
+    "timestamp": None
+}
+
+def market_update_payload() -> str:
+    """Serialized market_update message with fresh mock data"""
+    u = _draw(MOCK_DRAWS)
+    now_ms = time.time_ns() // 1_000_000
+    
+    # Combine all data
+    data = _MARKET_UPDATE["data"]
+    data["price"] = get_mock_price(u=u[0:1], now_ms=now_ms)
+    data["indicators"] = get_mock_indicators(u[1:4], now_ms)
+    data["sentiment"] = get_mock_sentiment(u[4:6], now_ms)
+    data["signal"] = get_mock_signal(u[6:11], now_ms)
+    data["risk"] = get_mock_risk(u[11:14], now_ms)
+    _MARKET_UPDATE["timestamp"] = now_ms
+    
+    return _dumps(_MARKET_UPDATE)
+
+STREAM_INTERVAL = 5  # seconds between market updates
+
+async def stream_market_updates():
+    """
+    Build and encode one market update per tick and broadcast it to every client
+    
+    Ticks fall on multiples of STREAM_INTERVAL in wall-clock time, so the time
+    spent building and sending an update does not push later ticks back.
+    """
+    while True:
+        if manager.active_connections:
+            try:
+                await manager.broadcast(market_update_payload())
+            except Exception as e:
+                logger.error(f"Error streaming market update: {e}")
+        
+        # Sleep until the next tick boundary
+        await asyncio.sleep(STREAM_INTERVAL - time.time() % STREAM_INTERVAL)
+
 # WebSocket endpoint
 @app.websocket("/stream")
-async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time data streaming"""
-    await manager.connect(websocket)
+async def websocket_endpoint(websocket: WebSocket, encoding: Optional[str] = None):
+    """
+    WebSocket endpoint for real-time data streaming
+    
+    Each update is one JSON text frame (the dashboard JSON.parses event.data),
+    with timestamps as epoch milliseconds. Clients connecting with
+    ?encoding=zstd get the same JSON zstd-compressed in binary frames instead;
+    the connection is refused if zstandard is not installed.
+    """
+    if encoding not in (None, "json") and not (encoding == "zstd" and _zstd is not None):
+        await websocket.close(code=1003)
+        return
+    
+    await manager.connect(websocket, zstd=encoding == "zstd")
     try:
+        # First update right away; later ones arrive through the broadcaster
+        await manager.send_personal_message(market_update_payload(), websocket)
+        
+        # Nothing is expected from the client; this just waits for it to leave
         while True:
-            # Send periodic updates
-            price_data = get_mock_price()
-            indicators_data = get_mock_indicators()
-            sentiment_data = get_mock_sentiment()
-            signal_data = get_mock_signal()
-            risk_data = get_mock_risk()
-            
-            # Combine all data
-            combined_data = {
-                "type": "market_update",
-                "data": {
-                    "price": price_data,
-                    "indicators": indicators_data,
-                    "sentiment": sentiment_data,
-                    "signal": signal_data,
-                    "risk": risk_data
-                },
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            await manager.send_personal_message(json.dumps(combined_data), websocket)
-            
-            # Wait 5 seconds before next update
-            await asyncio.sleep(5)
+            await websocket.receive_text()
             
     except WebSocketDisconnect:
         manager.disconnect(websocket)
         logger.info("WebSocket client disconnected")
 
+@app.on_event("startup")
+async def startup_event():
+    """Start the WebSocket broadcaster"""
+    app.state.stream_task = asyncio.create_task(stream_market_updates())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the WebSocket broadcaster"""
+    app.state.stream_task.cancel()
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    # loop/http "auto" pick uvloop and httptools when installed (uvicorn[standard],
+    # not on Windows). Clients only send small control messages, so inbound
+    # frames are capped well below the 16 MiB default. reload needs an import
+    # string, so it is left to the uvicorn CLI (uvicorn simple_main:app --reload)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="auto",
+        ws="websockets",
+        ws_max_size=65536
+    )
@@ -4,35 +4,62 @@ Implements signal generation logic for crypto trading decisions
 """
 
 import logging
+import sys
+from bisect import bisect_left, bisect_right
+from dataclasses import asdict, dataclass, fields, replace
 from datetime import datetime
 from typing import Dict, Tuple
 import numpy as np
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
 logger = logging.getLogger(__name__)
 
+# Sentiment confidence by how extreme the 0-100 score is: a score's bucket
+# is bisect_left over the bearish edges (<= 20/30/40 count as extreme) plus
+# bisect_right over the bullish edges (>= 60/70/80 count as extreme)
+SENTIMENT_BEARISH_EDGES = (20, 30, 40)
+SENTIMENT_BULLISH_EDGES = (60, 70, 80)
+SENTIMENT_CONFIDENCE = np.array([0.9, 0.8, 0.7, 0.6, 0.7, 0.8, 0.9])
+
+# calculate_signal_strength labels, split at combined scores 0.4/0.6/0.8
+SIGNAL_STRENGTH_EDGES = (0.4, 0.6, 0.8)
+SIGNAL_STRENGTHS = ("Weak", "Moderate", "Strong", "Very Strong")
+
+# slots=True needs Python 3.10; on 3.9 the class keeps a __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_SLOTS)
 class TradingStrategy:
-    """Trading strategy combining technical indicators and sentiment analysis"""
+    """
+    Trading strategy combining technical indicators and sentiment analysis
+    
+    Parameters are fixed per instance; update_strategy_parameters returns a
+    new strategy rather than changing this one.
+    """
+    
+    # Strategy parameters
+    momentum_weight: float = 0.6      # Weight for momentum signals
+    sentiment_weight: float = 0.4     # Weight for sentiment signals
+    
+    # Signal thresholds
+    buy_threshold: float = 0.6        # Minimum score for buy signal
+    sell_threshold: float = 0.4       # Maximum score for sell signal
+    confidence_threshold: float = 0.7  # Minimum confidence for signal
+    
+    # Technical indicator thresholds
+    rsi_oversold: int = 30
+    rsi_overbought: int = 70
+    adx_trend_threshold: int = 25
+    adx_strong_trend: int = 40
+    
+    # Sentiment thresholds
+    sentiment_bullish: int = 60
+    sentiment_bearish: int = 40
     
-    def __init__(self):
-        # Strategy parameters
-        self.momentum_weight = 0.6      # Weight for momentum signals
-        self.sentiment_weight = 0.4     # Weight for sentiment signals
-        
-        # Signal thresholds
-        self.buy_threshold = 0.6        # Minimum score for buy signal
-        self.sell_threshold = 0.4       # Maximum score for sell signal
-        self.confidence_threshold = 0.7  # Minimum confidence for signal
-        
-        # Technical indicator thresholds
-        self.rsi_oversold = 30
-        self.rsi_overbought = 70
-        self.adx_trend_threshold = 25
-        self.adx_strong_trend = 40
-        
-        # Sentiment thresholds
-        self.sentiment_bullish = 60
-        self.sentiment_bearish = 40
-        
     def generate_signal(self, price: float, rsi: float, adx: float, atr: float, sentiment_score: float) -> Dict:
         """
         Generate trading signal based on technical indicators and sentiment
@@ -90,13 +117,90 @@ class TradingStrategy:
                 "timestamp": datetime.now()
             }
             
-            logger.info(f"Trading signal generated: {signal} ({signal_strength}) - Confidence: {combined_confidence:.3f}")
+            logger.info("Trading signal generated: %s (%s) - Confidence: %.3f", signal, signal_strength, combined_confidence)
             return result
             
         except Exception as e:
-            logger.error(f"Error generating trading signal: {e}")
+            logger.error("Error generating trading signal: %s", e)
             return self._get_default_signal()
     
+    def generate_signal_batch(self, rsi: np.ndarray, adx: np.ndarray, sentiment: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Vectorized generate_signal scoring for many ticks or symbols at once
+        
+        Same rules as _calculate_momentum_signal, _calculate_sentiment_signal
+        and generate_signal's thresholds, evaluated with array masks.
+        
+        Args:
+            rsi: RSI values (0-100)
+            adx: ADX values (0-100)
+            sentiment: Sentiment scores (0-100)
+            
+        Returns:
+            Dict of arrays: signal, signal_strength, confidence, momentum_score,
+            sentiment_score and combined_score (unrounded)
+        """
+        rsi = np.ascontiguousarray(rsi, dtype=np.float64)
+        adx = np.ascontiguousarray(adx, dtype=np.float64)
+        sentiment = np.ascontiguousarray(sentiment, dtype=np.float64)
+        
+        if _score_kernel is not None:
+            signal_code, strong, confidence, momentum_score, combined_score = _score_kernel(
+                rsi, adx, sentiment, self.momentum_weight, self.sentiment_weight,
+                self.buy_threshold, self.sell_threshold, self.confidence_threshold,
+                self.rsi_oversold, self.rsi_overbought, self.adx_trend_threshold, self.adx_strong_trend
+            )
+            # Codes become strings only here, at the API boundary (-1 indexes "SELL")
+            return {
+                "signal": SIGNAL_NAMES[signal_code],
+                "signal_strength": np.where(
+                    signal_code == 0, "Neutral", np.where(strong, "Strong", "Moderate")
+                ),
+                "confidence": confidence,
+                "momentum_score": momentum_score,
+                "sentiment_score": sentiment / 100.0,
+                "combined_score": combined_score
+            }
+        
+        # Momentum: RSI zone sets score and confidence, ADX adds trend confidence
+        oversold = rsi < self.rsi_oversold
+        overbought = ~oversold & (rsi > self.rsi_overbought)
+        neutral_zone = ~oversold & ~overbought & (rsi >= 40) & (rsi <= 60)
+        momentum_score = np.clip(0.5 + 0.3 * oversold - 0.3 * overbought + 0.1 * neutral_zone, 0, 1)
+        momentum_confidence = np.clip(
+            0.5 + 0.2 * (oversold | overbought) + 0.1 * neutral_zone
+            + np.select([adx > self.adx_strong_trend, adx > self.adx_trend_threshold], [0.3, 0.2], -0.1),
+            0, 1
+        )
+        
+        # Sentiment: more extreme readings get more confidence
+        sentiment_score = sentiment / 100.0
+        sentiment_confidence = SENTIMENT_CONFIDENCE[
+            np.searchsorted(SENTIMENT_BEARISH_EDGES, sentiment, side="left")
+            + np.searchsorted(SENTIMENT_BULLISH_EDGES, sentiment, side="right")
+        ]
+        
+        # Combine signals with weights
+        combined_score = momentum_score * self.momentum_weight + sentiment_score * self.sentiment_weight
+        confidence = momentum_confidence * self.momentum_weight + sentiment_confidence * self.sentiment_weight
+        
+        confident = confidence >= self.confidence_threshold
+        buy = confident & (combined_score >= self.buy_threshold)
+        sell = confident & ~buy & (combined_score <= self.sell_threshold)
+        
+        return {
+            "signal": np.select([buy, sell], ["BUY", "SELL"], "HOLD"),
+            "signal_strength": np.select(
+                [buy & (combined_score >= 0.8), sell & (combined_score <= 0.2), buy | sell],
+                ["Strong", "Strong", "Moderate"],
+                "Neutral"
+            ),
+            "confidence": confidence,
+            "momentum_score": momentum_score,
+            "sentiment_score": sentiment_score,
+            "combined_score": combined_score
+        }
+    
     def _calculate_momentum_signal(self, rsi: float, adx: float) -> Tuple[float, float]:
         """
         Calculate momentum signal based on RSI and ADX
@@ -138,7 +242,7 @@ class TradingStrategy:
             return momentum_score, confidence
             
         except Exception as e:
-            logger.error(f"Error calculating momentum signal: {e}")
+            logger.error("Error calculating momentum signal: %s", e)
             return 0.5, 0.5
     
     def _calculate_sentiment_signal(self, sentiment_score: float) -> Tuple[float, float]:
@@ -156,19 +260,14 @@ class TradingStrategy:
             sentiment_signal = sentiment_score / 100.0
             
             # Calculate confidence based on how extreme the sentiment is
-            if sentiment_score >= 80 or sentiment_score <= 20:
-                confidence = 0.9  # Very high confidence for extreme sentiment
-            elif sentiment_score >= 70 or sentiment_score <= 30:
-                confidence = 0.8  # High confidence for strong sentiment
-            elif sentiment_score >= 60 or sentiment_score <= 40:
-                confidence = 0.7  # Moderate confidence for moderate sentiment
-            else:
-                confidence = 0.6  # Lower confidence for neutral sentiment
+            bucket = (bisect_left(SENTIMENT_BEARISH_EDGES, sentiment_score)
+                      + bisect_right(SENTIMENT_BULLISH_EDGES, sentiment_score))
+            confidence = float(SENTIMENT_CONFIDENCE[bucket])
             
             return sentiment_signal, confidence
             
         except Exception as e:
-            logger.error(f"Error calculating sentiment signal: {e}")
+            logger.error("Error calculating sentiment signal: %s", e)
             return 0.5, 0.5
     
     def _generate_reasoning(self, signal: str, strength: str, momentum_score: float, 
@@ -234,7 +333,7 @@ class TradingStrategy:
             return " | ".join(reasoning_parts)
             
         except Exception as e:
-            logger.error(f"Error generating reasoning: {e}")
+            logger.error("Error generating reasoning: %s", e)
             return f"Signal: {signal} | Error generating detailed reasoning"
     
     def calculate_signal_strength(self, combined_score: float) -> str:
@@ -247,14 +346,7 @@ class TradingStrategy:
         Returns:
             Signal strength string
         """
-        if combined_score >= 0.8:
-            return "Very Strong"
-        elif combined_score >= 0.6:
-            return "Strong"
-        elif combined_score >= 0.4:
-            return "Moderate"
-        else:
-            return "Weak"
+        return SIGNAL_STRENGTHS[bisect_right(SIGNAL_STRENGTH_EDGES, combined_score)]
     
     def validate_signal(self, signal_data: Dict) -> Dict:
         """
@@ -302,7 +394,7 @@ class TradingStrategy:
             return validation_result
             
         except Exception as e:
-            logger.error(f"Error validating signal: {e}")
+            logger.error("Error validating signal: %s", e)
             return {
                 "is_valid": False,
                 "warnings": [],
@@ -323,25 +415,99 @@ class TradingStrategy:
             "timestamp": datetime.now()
         }
     
-    def update_strategy_parameters(self, **kwargs):
-        """Update strategy parameters"""
-        for key, value in kwargs.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
-                logger.info(f"Updated strategy parameter {key} to {value}")
+    def update_strategy_parameters(self, **kwargs) -> "TradingStrategy":
+        """
+        Get a copy of this strategy with some parameters changed
+        
+        Unknown parameter names are ignored.
+        
+        Returns:
+            New TradingStrategy with the updated parameters
+        """
+        names = {field.name for field in fields(self)}
+        updates = {key: value for key, value in kwargs.items() if key in names}
+        for key, value in updates.items():
+            logger.info("Updated strategy parameter %s to %s", key, value)
+        return replace(self, **updates)
     
     def get_strategy_parameters(self) -> Dict:
         """Get current strategy parameters"""
-        return {
-            "momentum_weight": self.momentum_weight,
-            "sentiment_weight": self.sentiment_weight,
-            "buy_threshold": self.buy_threshold,
-            "sell_threshold": self.sell_threshold,
-            "confidence_threshold": self.confidence_threshold,
-            "rsi_oversold": self.rsi_oversold,
-            "rsi_overbought": self.rsi_overbought,
-            "adx_trend_threshold": self.adx_trend_threshold,
-            "adx_strong_trend": self.adx_strong_trend,
-            "sentiment_bullish": self.sentiment_bullish,
-            "sentiment_bearish": self.sentiment_bearish
-        }
+        return asdict(self)
+
+# Signal names indexed by _score_kernel's codes: 0 HOLD, 1 BUY, -1 SELL
+SIGNAL_NAMES = np.array(["HOLD", "BUY", "SELL"])
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True, parallel=True)
+    def _score_kernel(rsi, adx, sentiment, momentum_weight, sentiment_weight,
+                      buy_threshold, sell_threshold, confidence_threshold,
+                      rsi_oversold, rsi_overbought, adx_trend_threshold, adx_strong_trend):
+        """
+        Fused generate_signal_batch scoring, one element per prange iteration
+        
+        Returns signal codes (int8), strong flags, confidence, momentum score
+        and combined score, with no intermediate arrays. Compiled on the first
+        generate_signal_batch call, not at import; cache=True lets later
+        processes load the machine code from disk.
+        """
+        n = rsi.shape[0]
+        signal_code = np.zeros(n, dtype=np.int8)
+        strong = np.zeros(n, dtype=np.bool_)
+        confidence = np.empty(n)
+        momentum_score = np.empty(n)
+        combined_score = np.empty(n)
+        
+        for i in numba.prange(n):
+            # Momentum
+            score = 0.5
+            momentum_confidence = 0.5
+            if rsi[i] < rsi_oversold:
+                score += 0.3
+                momentum_confidence += 0.2
+            elif rsi[i] > rsi_overbought:
+                score -= 0.3
+                momentum_confidence += 0.2
+            elif 40 <= rsi[i] <= 60:
+                score += 0.1
+                momentum_confidence += 0.1
+            
+            if adx[i] > adx_strong_trend:
+                momentum_confidence += 0.3
+            elif adx[i] > adx_trend_threshold:
+                momentum_confidence += 0.2
+            else:
+                momentum_confidence -= 0.1
+            
+            score = min(max(score, 0.0), 1.0)
+            momentum_confidence = min(max(momentum_confidence, 0.0), 1.0)
+            
+            # Sentiment
+            s = sentiment[i]
+            if s >= 80 or s <= 20:
+                sentiment_confidence = 0.9
+            elif s >= 70 or s <= 30:
+                sentiment_confidence = 0.8
+            elif s >= 60 or s <= 40:
+                sentiment_confidence = 0.7
+            else:
+                sentiment_confidence = 0.6
+            
+            # Combine
+            combined = score * momentum_weight + s / 100.0 * sentiment_weight
+            conf = momentum_confidence * momentum_weight + sentiment_confidence * sentiment_weight
+            
+            if conf >= confidence_threshold:
+                if combined >= buy_threshold:
+                    signal_code[i] = 1
+                    strong[i] = combined >= 0.8
+                elif combined <= sell_threshold:
+                    signal_code[i] = -1
+                    strong[i] = combined <= 0.2
+            
+            confidence[i] = conf
+            momentum_score[i] = score
+            combined_score[i] = combined
+        
+        return signal_code, strong, confidence, momentum_score, combined_score
+else:
+    _score_kernel = None
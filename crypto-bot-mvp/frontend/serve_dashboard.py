@@ -1,21 +1,30 @@
 #!/usr/bin/env python3
-import http.server
-import socketserver
 import os
 
-# Change to the directory containing index.html
-os.chdir('E:/crypto-watch/crypto-bot-mvp/frontend')
+from aiohttp import web
 
-class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
-    def end_headers(self):
-        self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
-        self.send_header('Pragma', 'no-cache')
-        self.send_header('Expires', '0')
-        super().end_headers()
+# Directory containing index.html
+FRONTEND_DIR = 'E:/crypto-watch/crypto-bot-mvp/frontend'
+
+@web.middleware
+async def no_cache(request, handler):
+    response = await handler(request)
+    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
+    response.headers['Pragma'] = 'no-cache'
+    response.headers['Expires'] = '0'
+    return response
+
+async def index(request):
+    return web.FileResponse(os.path.join(FRONTEND_DIR, 'index.html'))
 
 PORT = 3000
 
-with socketserver.TCPServer(("", PORT), MyHTTPRequestHandler) as httpd:
+# FileResponse (used by the static route too) sends files with sendfile(2)
+app = web.Application(middlewares=[no_cache])
+app.router.add_get('/', index)
+app.router.add_static('/', FRONTEND_DIR, show_index=True)
+
+if __name__ == '__main__':
     print(f"Serving at http://localhost:{PORT}")
     print("Press Ctrl+C to stop")
-    httpd.serve_forever()
+    web.run_app(app, port=PORT, print=None)